@@ -0,0 +1,39 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+UNMATCHED_DIR = os.path.join(ROOT, "unmatched_simulator")
+
+# Every case runs in a fresh interpreter: (label, python arguments, working directory)
+CASES = [
+    ("python -c pass", ["-c", "pass"], ROOT),
+    ("import tournament", ["-c", "import tournament"], ROOT),
+    ("import sim", ["-c", "import sim"], UNMATCHED_DIR),
+    ("import main", ["-c", "import main"], UNMATCHED_DIR),
+    ("import markov_chain", ["-c", "import markov_chain"], UNMATCHED_DIR),
+    ("sim.py --help", [os.path.join(UNMATCHED_DIR, "sim.py"), "--help"], ROOT),
+]
+
+
+def time_startup(args, cwd, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=cwd, check=True, stdout=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Interpreter startup and import time of the simulators")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'case':<22}{'median':>10}{'min':>10}")
+    for label, case_args, cwd in CASES:
+        times = time_startup(case_args, cwd, args.repeat)
+        print(f"{label:<22}{statistics.median(times) * 1000:>8.0f}ms{min(times) * 1000:>8.0f}ms")
@@ -0,0 +1,275 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+UNMATCHED_DIR = os.path.join(ROOT, "unmatched_simulator")
+sys.path[:0] = [ROOT, UNMATCHED_DIR]
+
+import markov_chain  # noqa: E402
+from convergence import PosteriorDraws  # noqa: E402
+import sim  # noqa: E402
+from matchup_table import load_matchup_table  # noqa: E402
+from results_io import BinaryLogWriter, CsvLogWriter  # noqa: E402
+from tournament import Tournament, double_elimination, run_headless, run_swiss, single_elimination  # noqa: E402
+from tournament.batch import simulate_batch  # noqa: E402
+from tournament.logs import Log  # noqa: E402
+from tournament.rng import RandomStream  # noqa: E402
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_PATH = os.path.join(BENCH_DIR, "results.json")
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+SIZES = (64, 256, 1024, 4096)
+# Slower than the baseline by more than this fraction counts as a regression
+TOLERANCE = 0.10
+
+
+# === Synthetic Unmatched data ===
+def write_matrix_csv(path, names, values):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("category," + ",".join(names) + "\n")
+        for name, row in zip(names, values.astype(str)):
+            f.write(name + "," + ",".join(row) + "\n")
+
+
+def synthetic_assets(asset_dir, num_fighters, seed=0):
+    # Fighters with a hidden strength; probabilities.csv holds the chance (in %) that the column beats the row,
+    # like the UM League export, and some cells have too few games or no data (-2)
+    rng = np.random.default_rng(seed)
+    names = [f"Fighter {i}" for i in range(1, num_fighters + 1)]
+    strength = rng.lognormal(0, 0.3, num_fighters)
+    row_wins = np.rint(100 * strength[:, np.newaxis] / (strength[:, np.newaxis] + strength)).astype(np.int64)
+    counts = rng.integers(0, 60, (num_fighters, num_fighters))
+    counts = np.triu(counts, 1) + np.triu(counts, 1).T
+    probs = np.where(rng.random((num_fighters, num_fighters)) < 0.05, -2, 100 - row_wins)
+
+    os.makedirs(asset_dir, exist_ok=True)
+    with open(os.path.join(asset_dir, "players.json"), "w") as f:
+        json.dump([{"id": i, "name": name} for i, name in enumerate(names, start=1)], f)
+    write_matrix_csv(os.path.join(asset_dir, "probabilities.csv"), names, probs)
+    write_matrix_csv(os.path.join(asset_dir, "matches_count.csv"), names, counts)
+
+
+# === Timing ===
+def measure(cases, repeat):
+    # Seconds per call of every case, `repeat` times. Each repeat loops the call for at least 0.2 s
+    # (timeit's autorange), so sub-millisecond cases are timed well above the timer resolution; the repeats
+    # go round-robin over the cases, so a slow spell of the machine does not hit every repeat of one case
+    timers = [timeit.Timer(fn) for fn in cases]
+    numbers = [timer.autorange()[0] for timer in timers]
+    times = [[] for _ in cases]
+    for _ in range(repeat):
+        for timer, number, case_times in zip(timers, numbers, times):
+            case_times.append(timer.timeit(number) / number)
+    return times
+
+
+# === Benchmarks ===
+# Each one gets (fighters, asset folder, scratch folder) and returns (callable, items, unit);
+# the work per call shrinks with the field so every size finishes in about a second
+def bench_python_tournament(n, assets, scratch):
+    tournaments = max(5, 12800 // n)
+    rng = RandomStream(0)
+    return lambda: [sim.run_tournament_with_rounds(rng) for _ in range(tournaments)], tournaments, "tournaments"
+
+
+def bench_run_simulations(n, assets, scratch):
+    # Batch engine with the per-tournament CSV log, as in the 100k job
+    tournaments = max(1000, 640000 // n)
+    return (lambda: sim.run_simulations(tournaments, seed=0, log_dir=scratch)), tournaments, "tournaments"
+
+
+def bench_run_simulations_bayes(n, assets, scratch):
+    # Batch engine on win matrices sampled from the Beta posteriors, one per 1000 tournaments
+    tournaments = max(1000, 640000 // n // 1000 * 1000)
+    return (lambda: sim.run_simulations(tournaments, seed=0, log_dir=scratch, draws=PosteriorDraws(n, 1000))), \
+        tournaments, "tournaments"
+
+
+def bench_run_simulations_python(n, assets, scratch):
+    tournaments = max(5, 6400 // n)
+    return (lambda: sim.run_simulations(tournaments, engine="python", log_dir=scratch)), tournaments, "tournaments"
+
+
+def bench_markov(method):
+    def bench(n, assets, scratch):
+        table = sim.load_data()[1]
+        P = markov_chain.build_transition_matrix(table.probs, table.counts)
+        return (lambda: markov_chain.stationary_distribution(P, method)), 1, "solves"
+    return bench
+
+
+def bench_bracket(name):
+    # Headless discrete-event run of a generated bracket, the scheduling run_sim does without rendering
+    def bench(n, assets, scratch):
+        player_list = [{"id": i, "name": f"Player_{i}", "speed": 1.0} for i in range(1, n + 1)]
+        ids = [p['id'] for p in player_list]
+        rng = RandomStream(0)
+        if name == "swiss":
+            rounds = max(1, (n - 1).bit_length())
+            return (lambda: run_swiss(player_list, rng)), n // 2 * rounds, "matches"
+        matches = (single_elimination if name == "single" else double_elimination)(ids)[0]
+        return (lambda: run_headless(Tournament([dict(m) for m in matches], player_list), rng)), len(matches), "matches"
+    return bench
+
+
+def bench_csv_parse(n, assets, scratch):
+    players = sim.load_data()[0]
+    return (lambda: load_matchup_table(players, assets, cache_dir=None)), n * n, "cells"
+
+
+def bench_table_cache(n, assets, scratch):
+    players = sim.load_data()[0]
+    cache_dir = os.path.join(scratch, "cache")
+    load_matchup_table(players, assets, cache_dir=cache_dir)
+    return (lambda: load_matchup_table(players, assets, cache_dir=cache_dir)), n * n, "cells"
+
+
+def bench_players_json(n, assets, scratch):
+    path = os.path.join(assets, "players.json")
+
+    def load():
+        with open(path) as f:
+            return json.load(f)
+    return load, n, "players"
+
+
+def bench_log_writer(writer_class, name):
+    def bench(n, assets, scratch):
+        table = sim.load_data()[1]
+        tournaments = max(1000, 6400000 // n)
+        champions, defeated = simulate_batch(np.full((n, n), 0.5), tournaments, np.random.default_rng(0))
+        labels = table.ids if writer_class is BinaryLogWriter else table.names
+
+        def write():
+            with writer_class(os.path.join(scratch, name), labels, defeated.shape[1]) as log:
+                log.write(champions, defeated)
+        return write, tournaments, "tournaments"
+    return bench
+
+
+def bench_match_lines(n, assets, scratch):
+    # Match-level lines through the buffered Log into a file
+    lines = 100000
+    names = sim.load_data()[1].names
+
+    def write():
+        with open(os.path.join(scratch, "matches.txt"), "w", encoding="utf-8") as f:
+            log = Log("match", [f])
+            for i in range(lines):
+                log.match(f"T{i}: {names[i % n]} vs {names[(i + 1) % n]}, Winner: {names[i % n]}")
+            log.flush()
+    return write, lines, "lines"
+
+
+BENCHMARKS = {
+    "sim.run_tournament_with_rounds": bench_python_tournament,
+    "sim.run_simulations[batch]": bench_run_simulations,
+    "sim.run_simulations[bayes]": bench_run_simulations_bayes,
+    "sim.run_simulations[python]": bench_run_simulations_python,
+    "markov.power": bench_markov("power"),
+    "markov.direct": bench_markov("direct"),
+    "bracket.single": bench_bracket("single"),
+    "bracket.double": bench_bracket("double"),
+    "bracket.swiss": bench_bracket("swiss"),
+    "io.csv_parse": bench_csv_parse,
+    "io.table_cache": bench_table_cache,
+    "io.players_json": bench_players_json,
+    "io.log_csv": bench_log_writer(CsvLogWriter, "tournament_log.csv"),
+    "io.log_bin": bench_log_writer(BinaryLogWriter, "tournament_log.bin"),
+    "io.match_lines": bench_match_lines,
+}
+
+
+def run_suite(sizes, names, repeat):
+    results = []
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as scratch:
+            assets = os.path.join(scratch, "assets")
+            synthetic_assets(assets, n)
+            sim.asset_dir = assets
+            cases = [BENCHMARKS[name](n, assets, scratch) for name in names]
+            for fn, _, _ in cases:
+                fn()  # warm-up: imports, caches, first allocation
+            for name, (_, items, unit), times in zip(names, cases, measure([fn for fn, _, _ in cases], repeat)):
+                best = min(times)
+                results.append({"name": name, "fighters": n, "unit": unit, "items": items,
+                                "best": best, "median": statistics.median(times), "times": times,
+                                "per_second": items / best if best else None})
+                print(f"{name:<32}{n:>6}{best * 1000:>12.2f}ms{items / best:>14,.0f} {unit}/s")
+    sim.asset_dir = sim.ASSET_DIR
+    sim.read_data.cache_clear()
+    return results
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    # best time now / best time in the baseline, per benchmark and size. A regression is more than
+    # `tolerance` slower and also slower than every baseline repeat, so the machine's own spread does not count
+    old = {(r["name"], r["fighters"]): r for r in baseline["results"]}
+    regressions = []
+    print(f"\n{'benchmark':<32}{'fighters':>8}{'baseline':>12}{'now':>12}{'ratio':>8}")
+    for r in results:
+        before = old.get((r["name"], r["fighters"]))
+        if before is None:
+            continue
+        ratio = r["best"] / before["best"]
+        slower = ratio > 1 + tolerance and r["best"] > max(before.get("times", [before["best"]]))
+        flag = "  slower" if slower else "  noise" if ratio > 1 + tolerance else \
+            "  faster" if ratio < 1 - tolerance else ""
+        print(f"{r['name']:<32}{r['fighters']:>8}{before['best'] * 1000:>10.2f}ms{r['best'] * 1000:>10.2f}ms"
+              f"{ratio:>8.2f}{flag}")
+        if slower:
+            regressions.append(r)
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks of the simulation hot paths on synthetic fighter tables")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="fighter counts")
+    parser.add_argument("--only", nargs="+", default=None,
+                        help="benchmark name prefixes, e.g. sim markov.power io.log")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default=RESULTS_PATH, help="JSON file for the results")
+    parser.add_argument("--baseline", default=BASELINE_PATH,
+                        help="JSON results to compare against (saved on this machine with --save-baseline)")
+    parser.add_argument("--save-baseline", action="store_true", help="also store these results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="slowdown (fraction) that counts as a regression")
+    args = parser.parse_args()
+
+    names = [name for name in BENCHMARKS if args.only is None or any(name.startswith(o) for o in args.only)]
+    if not names:
+        parser.error(f"no benchmark matches {args.only}; available: {', '.join(BENCHMARKS)}")
+
+    results = run_suite(args.sizes, names, args.repeat)
+    report = {
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.platform(),
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults saved to {args.output}")
+
+    if args.save_baseline:
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {BASELINE_PATH}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.tolerance:.0%}")
+            sys.exit(1)
+    else:
+        print(f"No baseline at {args.baseline}, nothing to compare; save one with --save-baseline")
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The tournament package from the repo root, the Unmatched modules flat, like the scripts import them
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "unmatched_simulator")]
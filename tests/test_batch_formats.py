@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from tournament import MatrixModel, Tournament, double_elimination, run_headless, run_swiss
+from tournament.batch import simulate_format_batch
+from tournament.rng import RandomStream, generator
+
+HEADLESS_RUNS = 4000
+BATCH_RUNS = 100000
+# Allowed gap between the two estimates of a champion share, in standard errors
+MAX_Z = 4.5
+
+
+def strength_matrix(num_players):
+    # Bradley-Terry win matrix with clearly different strengths
+    strength = np.linspace(0.5, 2.0, num_players)
+    return strength[:, np.newaxis] / (strength[:, np.newaxis] + strength)
+
+
+def headless_shares(fmt, W, runs, seed):
+    # Champion shares of the discrete-event engine, with a new random seeding every run
+    ids = list(range(1, W.shape[0] + 1))
+    model = MatrixModel(ids, W)
+    players = [{"id": i, "name": f"Player_{i}"} for i in ids]
+    rng = RandomStream(seed)
+    counts = np.zeros(len(ids))
+    for _ in range(runs):
+        seeding = list(players)
+        rng.shuffle(seeding)
+        if fmt == "double":
+            matches = double_elimination([p['id'] for p in seeding])[0]
+            tournament = Tournament([dict(m) for m in matches], seeding)
+            run_headless(tournament, rng, outcome=model)
+            champion = tournament.matches[-1]['winner']
+        else:
+            champion = run_swiss(seeding, rng, outcome=model)[1].standings()[0]
+        counts[champion - 1] += 1
+    return counts / runs
+
+
+@pytest.mark.parametrize("fmt", ["double", "swiss"])
+@pytest.mark.parametrize("num_players", [7, 8])
+def test_batch_matches_headless(fmt, num_players):
+    W = strength_matrix(num_players)
+    headless = headless_shares(fmt, W, HEADLESS_RUNS, seed=1)
+    champions, _ = simulate_format_batch(fmt, W, BATCH_RUNS, generator(2))
+    batch = np.bincount(champions, minlength=num_players) / BATCH_RUNS
+
+    stderr = np.sqrt(batch * (1 - batch) * (1 / HEADLESS_RUNS + 1 / BATCH_RUNS))
+    assert np.all(np.abs(headless - batch) <= MAX_Z * stderr), (headless, batch)
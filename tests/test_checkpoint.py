@@ -0,0 +1,59 @@
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pytest
+
+from checkpoint import config_hash
+
+UNMATCHED_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "unmatched_simulator")
+# sim.py with its log folder moved, so the tests do not touch unmatched_simulator/log
+RUN_SIM = "import sys, sim; sim.LOG_DIR = sys.argv[1]; sim.main(sys.argv[2:])"
+
+
+def start_sim(log_dir, *options):
+    return subprocess.Popen([sys.executable, "-c", RUN_SIM, str(log_dir), "--seed", "7", *options],
+                            cwd=UNMATCHED_DIR, stdout=subprocess.PIPE, text=True)
+
+
+def run_sim(log_dir, *options):
+    # stdout of a run that has to finish normally
+    output, _ = start_sim(log_dir, *options).communicate()
+    return output
+
+
+def read_logs(log_dir):
+    # The format's folder: log_dir for single elimination, a subfolder for the others
+    folder = next(root for root, _, files in os.walk(log_dir) if "summary.txt" in files)
+    with open(os.path.join(folder, "summary.txt"), "rb") as f, \
+            open(os.path.join(folder, "tournament_log.csv"), "rb") as g:
+        return f.read(), g.read()
+
+
+@pytest.mark.parametrize("options", [["-n", "300000"], ["-n", "60000", "--format", "swiss"],
+                                     ["-n", "300000", "--bayes", "--draw-size", "5000"]])
+def test_resume_after_kill_matches_uninterrupted_run(tmp_path, options):
+    run_sim(tmp_path / "full", *options)
+
+    # Checkpoint after every batch, kill the run once one is on disk, then resume it
+    interrupted = tmp_path / "interrupted"
+    process = start_sim(interrupted, *options, "--checkpoint-every", "0.001")
+    while process.poll() is None and not any("checkpoint.npz" in files for _, _, files in os.walk(interrupted)):
+        time.sleep(0.01)
+    process.send_signal(signal.SIGKILL)
+    assert process.wait() == -signal.SIGKILL, "the run finished before it could be killed"
+    assert "Resuming from" in run_sim(interrupted, *options, "--resume")
+
+    assert read_logs(interrupted) == read_logs(tmp_path / "full")
+
+
+def test_hash_sees_thin_matchup_cells():
+    # A cell below the 50/50 fallback threshold still changes the run: --bayes samples from it
+    probs = np.array([[-2.0, 40.0], [60.0, -2.0]])
+    counts = np.array([[0.0, 3.0], [3.0, 0.0]])
+    changed = probs.copy()
+    changed[0, 1], changed[1, 0] = 30.0, 70.0
+    assert config_hash({"bayes": True}, probs, counts) != config_hash({"bayes": True}, changed, counts)
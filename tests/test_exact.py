@@ -0,0 +1,40 @@
+import numpy as np
+
+from exact import bracket_win_probabilities
+from tournament.batch import simulate_batch
+from tournament.rng import generator
+
+RUNS = 200000
+MAX_Z = 4.5
+
+
+class FixedSeeding:
+    # Generator stand-in for simulate_batch: every tournament gets the same seating, the match draws stay random
+    def __init__(self, order, rng):
+        self.order = np.asarray(order)
+        self.rng = rng
+
+    def permuted(self, slots, axis):
+        return np.tile(self.order, (slots.shape[0], 1))
+
+    def random(self, size):
+        return self.rng.random(size)
+
+
+def random_matrix(num_players, rng):
+    # Non-transitive win rates with W[j, i] = 1 - W[i, j]
+    upper = np.triu(rng.uniform(0.1, 0.9, (num_players, num_players)), 1)
+    return upper + np.tril(1 - upper.T, -1) + np.eye(num_players) / 2
+
+
+def test_exact_matches_simulation_on_odd_bracket():
+    rng = generator(3)
+    W = random_matrix(11, rng)
+    order = rng.permutation(11)
+    exact = bracket_win_probabilities(W, order)[0]
+    assert np.isclose(exact.sum(), 1)
+
+    champions, _ = simulate_batch(W, RUNS, FixedSeeding(order, rng))
+    simulated = np.bincount(champions, minlength=11) / RUNS
+    stderr = np.sqrt(exact * (1 - exact) / RUNS)
+    assert np.all(np.abs(simulated - exact) <= MAX_Z * stderr + 1e-12), (exact, simulated)
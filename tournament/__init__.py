@@ -0,0 +1,7 @@
+from .bracket import double_elimination, generate_pairs, layout, seed_order, single_elimination
+from .clock import SimClock, format_minutes
+from .core import Tournament, load_json
+from .headless import run_headless, run_rounds
+from .outcomes import OUTCOMES, CoinFlip, MatrixModel, SpeedModel
+from .schedule import POLICIES, estimate_format
+from .swiss import SwissEvent, run_swiss
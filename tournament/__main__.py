@@ -0,0 +1,87 @@
+import argparse
+import os
+import time
+
+from .clock import format_minutes
+from .formats import FORMATS
+from .headless import champion_shares
+from .instrument import Instrument, profile
+from .outcomes import OUTCOMES
+from .rng import BIT_GENERATORS, DEFAULT_BIT_GENERATOR
+from .schedule import POLICIES, estimate_format
+
+
+def print_estimate(stats, elapsed, top):
+    tables = stats['tables'] or "unlimited"
+    print(f"\n{stats['runs']} tournaments, {tables} tables, policy '{stats['policy']}' "
+          f"in {elapsed:.2f}s ({elapsed / stats['runs'] * 1e6:.0f} us each)")
+    print(f"Mean duration: {format_minutes(stats['mean'])}")
+    for p, minutes in stats['percentiles'].items():
+        print(f"  p{p:<2d} {format_minutes(minutes)}")
+    print(f"Table utilization: {stats['utilization'] * 100:.1f}% (peak {stats['peak_tables']} tables in use)")
+    print("Critical path matches (share of runs):")
+    for match_id, label, share in stats['critical_path'][:top]:
+        print(f"  Match {match_id} ({label}): {share * 100:.1f}%")
+
+
+def print_champions(shares, name, outcome, top):
+    print(f"\nChampion chances, {name} ({outcome} outcome), batch simulator:")
+    for rank, (player, share) in enumerate(shares[:top], start=1):
+        print(f"  {rank}. {player['name']} - {share * 100:.2f}%")
+
+
+def log_dir(name):
+    # Next to the format's match file, e.g. double_elimination/log/
+    return os.path.join(os.path.dirname(FORMATS[name]["matches"]), "log")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run tournaments without rendering and report durations")
+    parser.add_argument("format", choices=sorted(FORMATS))
+    parser.add_argument("--runs", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--rng", choices=BIT_GENERATORS, default=DEFAULT_BIT_GENERATOR,
+                        help="bit generator behind the seed")
+    parser.add_argument("--generate", action="store_true", help="generate the bracket for players.json")
+    parser.add_argument("--players", type=int, default=None, help="generated bracket for N synthetic players")
+    parser.add_argument("--tables", type=int, default=None, help="matches that can be played at once (default: no limit)")
+    parser.add_argument("--policy", choices=sorted(POLICIES) + ["all"], default="bracket",
+                        help="which ready match gets a free table first; 'all' compares every policy")
+    parser.add_argument("--outcome", choices=sorted(OUTCOMES), default="coin",
+                        help="who wins: coin flip, or the faster player more often")
+    parser.add_argument("--champions", action="store_true",
+                        help="each player's chance to win instead of durations, from the vectorized batch "
+                             "simulator on the outcome's win matrix (generated bracket, random seeding)")
+    parser.add_argument("--top", type=int, default=5, help="critical path matches (or champions) to list")
+    parser.add_argument("--instrument", action="store_true",
+                        help="time setup/simulation/statistics, tournaments and matches per second, peak RSS "
+                             "(<format folder>/log/instrumentation.json)")
+    parser.add_argument("--profile", action="store_true", help="cProfile the runs into <format folder>/log/profile.*")
+    args = parser.parse_args()
+
+    instrument = Instrument(enabled=args.instrument)
+    if args.champions:
+        if args.tables is not None or args.policy != "bracket":
+            parser.error("--champions estimates winners only, drop --tables / --policy")
+        with profile(log_dir(args.format), args.profile), instrument.phase("simulate"):
+            shares = champion_shares(args.format, args.runs, args.seed, args.players, args.outcome, args.rng)
+        instrument.count("tournaments", args.runs)
+        print_champions(shares, args.format, args.outcome, args.top)
+        if args.instrument:
+            print("\n".join(instrument.lines(instrument.write(log_dir(args.format)))))
+        return
+
+    policies = sorted(POLICIES) if args.policy == "all" else [args.policy]
+    with profile(log_dir(args.format), args.profile):
+        for policy in policies:
+            # Same seed for every policy, so they are compared on the same outcomes where the brackets allow
+            start = time.perf_counter()
+            stats = estimate_format(args.format, args.runs, args.tables, policy, args.seed, args.players,
+                                    args.generate, args.outcome, instrument, args.rng)
+            print_estimate(stats, time.perf_counter() - start, args.top)
+    if args.instrument:
+        print("\n".join(instrument.lines(instrument.write(log_dir(args.format)))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+import argparse
+from collections import Counter
+
+import pygame
+
+from .bracket import layout
+from .clock import DEFAULT_CLOCK_SPEED, SPEEDS, SimClock, format_minutes
+from .core import Tournament, load_json
+from .formats import FORMATS, PLAYERS_PATH, build_format, synthetic_players
+from .logs import LEVELS, open_log
+from .outcomes import OUTCOMES
+from .render import BracketView
+from .rng import BIT_GENERATORS, DEFAULT_BIT_GENERATOR, RandomStream
+from .swiss import SwissEvent
+
+WIDTH, HEIGHT = 1800, 1000
+FPS = 60
+SPEED_KEYS = {pygame.K_1: "1x", pygame.K_2: "60x", pygame.K_3: "max"}
+MATCH_WIDTH = 200
+MATCH_HEIGHT = 50
+SPACING_X = 240
+SPACING_Y = 100
+SWISS_SPACING_Y = 80
+
+
+# === Command line ===
+def parse_args(swiss=False):
+    parser = argparse.ArgumentParser()
+    if swiss:
+        parser.add_argument("--replay", action="store_true", help="replay the pre-paired rounds of swiss_matches.json")
+        parser.add_argument("--rounds", type=int, default=None, help="number of rounds (default: log2 of the field)")
+    else:
+        parser.add_argument("--generate", action="store_true", help="generate the bracket for players.json")
+    parser.add_argument("--players", type=int, default=None, help="N synthetic players instead of players.json")
+    parser.add_argument("--speed", choices=SPEEDS, default=DEFAULT_CLOCK_SPEED,
+                        help="simulated time per wall second (keys 1/2/3 switch it live)")
+    parser.add_argument("--outcome", choices=sorted(OUTCOMES), default="coin", help="who wins a match")
+    parser.add_argument("--verbosity", choices=LEVELS, default="match",
+                        help="console log: summary (results only), round (adds finished rounds), match (adds every match)")
+    parser.add_argument("--seed", type=int, default=None, help="master seed: replays the same results")
+    parser.add_argument("--rng", choices=BIT_GENERATORS, default=DEFAULT_BIT_GENERATOR,
+                        help="bit generator behind the seed")
+    return parser.parse_args()
+
+
+def load_players(args, rng):
+    return synthetic_players(args.players, rng) if args.players else load_json(PLAYERS_PATH)
+
+
+# === Match cards ===
+def card_painter(player_names, title, hide_pending=False):
+    def draw_card(surface, match, x, y, text):
+        done = match['status'] == 'done'
+        pygame.draw.rect(surface, (50, 50, 50), (x, y, MATCH_WIDTH, MATCH_HEIGHT), border_radius=6)
+        pygame.draw.rect(surface, (0, 255, 0) if done else (0, 120, 255), (x, y, MATCH_WIDTH, MATCH_HEIGHT), 2)
+        surface.blit(text.render(title(match), (255, 255, 0)), (x, y - 18))
+
+        if hide_pending and match['status'] == 'pending':
+            return
+        for slot, offset in (('p1', 5), ('p2', 25)):
+            if match[slot] is None:
+                continue
+            color = ((0, 255, 0) if match[slot] == match['winner'] else (255, 0, 0)) if done else (255, 255, 255)
+            surface.blit(text.render(player_names[match[slot]], color), (x + 5, y + offset))
+
+    return draw_card
+
+
+def card_key(match):
+    # Cards look the same for equal keys, so the rendered surfaces are shared
+    return match.get('bracket'), match['round'], match['status'], match['p1'], match['p2'], match['winner']
+
+
+# === Window and frame loop ===
+class App:
+    def __init__(self, caption, args, draw_card, spacing_y=SPACING_Y):
+        pygame.init()
+        self.caption = caption
+        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        pygame.display.set_caption(caption)
+        self.font = pygame.font.SysFont("Arial", 16)
+        self.frame_clock = pygame.time.Clock()
+        self.sim_clock = SimClock(args.speed)
+        self.view = BracketView(self.screen, self.font, MATCH_WIDTH, MATCH_HEIGHT, draw_card, card_key,
+                                title_height=18)
+        self.spacing_y = spacing_y
+        # Console log, written out once per frame
+        self.log = open_log(level=args.verbosity)
+
+    def run(self, tournament, step, is_done, report):
+        # step() runs one fixed simulation step and returns True when the event is over;
+        # report() prints the results once
+        running = True
+        done = False
+        label = None
+        while running:
+            if not done:
+                self.sim_clock.advance(step)
+                # Progress bars of running matches move every frame
+                self.view.mark_dirty(tournament.running)
+                if label != self.sim_clock.label():
+                    label = self.sim_clock.label()
+                    pygame.display.set_caption(f"{self.caption} - {label}")
+
+            if not done and is_done():
+                report()
+                self.log.summary("\n--- TOURNAMENT COMPLETE ---")
+                self.log.summary(f"Total duration: {format_minutes(self.sim_clock.now)}")
+                done = True
+            self.log.flush()
+
+            self.view.draw(tournament.by_id)
+            self.frame_clock.tick(FPS)
+
+            # Handle quit, scrolling and speed changes
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type == pygame.MOUSEWHEEL:
+                    self.view.wheel(event)
+                elif event.type == pygame.KEYDOWN and event.key in SPEED_KEYS:
+                    self.sim_clock.set_speed(SPEED_KEYS[event.key])
+
+        self.log.close()
+        pygame.quit()
+
+
+# === Elimination brackets ===
+def bracket_app(name, caption):
+    args = parse_args()
+    rng = RandomStream(args.seed, args.rng)
+    player_list = load_players(args, rng)
+    player_names = {p['id']: p['name'] for p in player_list}
+    outcome = OUTCOMES[args.outcome](player_list)
+
+    bracket_matches, ranking_order = build_format(name, player_list, args.generate or bool(args.players))
+    tournament = Tournament(bracket_matches, player_list)
+    if name == "double":
+        title = lambda match: f"{match['bracket']} R{match['round']}"
+    else:
+        title = lambda match: f"R{match['round']}"
+
+    app = App(caption, args, card_painter(player_names, title))
+    app.view.add(layout(tournament.matches, spacing_x=SPACING_X, spacing_y=SPACING_Y))
+    sim_clock, view, log = app.sim_clock, app.view, app.log
+    round_key = lambda match: (match.get('bracket'), match['round'])
+    unfinished = Counter(round_key(m) for m in tournament.matches)
+
+    def step():
+        # Finish matches that are over, then start whatever they freed at the same instant
+        for m in list(tournament.running.values()):
+            m['progress'] = (sim_clock.now - m['start_time']) / tournament.estimated_time(m)
+            if m['progress'] >= 1:
+                m['end_time'] = sim_clock.now
+                tournament.finish(m, outcome.winner(m, rng))
+                view.mark_dirty([m['id']])
+                view.mark_dirty(dependent['id'] for dependent, _ in tournament.dependents[m['id']])
+                if log.matches:
+                    log.match(f"[MATCH DONE] Match {m['id']} ({player_names[m['p1']]} vs {player_names[m['p2']]}) "
+                              f"finished in {m['end_time'] - m['start_time']:.1f} minutes. "
+                              f"Winner: {player_names[m['winner']]}")
+                unfinished[round_key(m)] -= 1
+                if unfinished[round_key(m)] == 0:
+                    log.round(f"[ROUND DONE] {title(m)} at {format_minutes(sim_clock.now)}")
+
+        for m in tournament.startable():
+            tournament.start(m)
+            m['start_time'] = sim_clock.now
+            m['progress'] = 0
+        return tournament.is_done()
+
+    def report():
+        log.summary("\n--- FINAL RANKING ---")
+        for i, (match_id, player_id) in enumerate(zip(ranking_order, tournament.ranking(ranking_order))):
+            if player_id is None:
+                log.summary(f"{i+1}. ??? (match {match_id} not found)")
+                continue
+            log.summary(f"{i+1}. {player_names.get(player_id, f'Player_{player_id}')}")
+
+    app.run(tournament, step, tournament.is_done, report)
+
+
+# === Swiss ===
+def swiss_app(caption):
+    args = parse_args(swiss=True)
+    rng = RandomStream(args.seed, args.rng)
+    player_list = load_players(args, rng)
+    player_names = {p['id']: p['name'] for p in player_list}
+    outcome = OUTCOMES[args.outcome](player_list)
+    round_break = FORMATS["swiss"]["round_break"]
+
+    # Standings and pairing; in replay mode the rounds come from the JSON file instead
+    swiss_event = SwissEvent([p['id'] for p in player_list], args.rounds)
+    if args.replay:
+        tournament = Tournament(load_json(FORMATS["swiss"]["matches"]), player_list)
+        swiss_event.num_rounds = max(m['round'] for m in tournament.matches)
+    else:
+        tournament = Tournament([], player_list)
+    matches = tournament.matches
+
+    app = App(caption, args, card_painter(player_names, lambda match: f"R{match['round']}", hide_pending=True),
+              SWISS_SPACING_Y)
+    sim_clock, view, log = app.sim_clock, app.view, app.log
+    round_positions = {}
+
+    def place_matches(new_matches):
+        coords = {}
+        for match in new_matches:
+            idx = round_positions.get(match['round'], 0)
+            coords[match['id']] = (100 + (match['round'] - 1) * SPACING_X, 100 + idx * SWISS_SPACING_Y)
+            round_positions[match['round']] = idx + 1
+        view.add(coords)
+
+    def start_round(round_num):
+        if not args.replay:
+            pairs, bye = swiss_event.pair_round()
+            new_matches = swiss_event.round_matches(pairs, len(matches) + 1)
+            tournament.add_matches(new_matches)
+            place_matches(new_matches)
+            if bye is not None:
+                log.round(f"[BYE] R{round_num} {player_names[bye]}")
+
+        for m in matches:
+            if m['round'] == round_num:
+                tournament.start(m)
+                m['start_time'] = sim_clock.now
+                m['progress'] = 0
+
+    place_matches(matches)
+    state = {"round": 0, "next_round_at": 0.0}
+
+    # The break between rounds is simulated time, not a sleep
+    def step():
+        for m in list(tournament.running.values()):
+            m['progress'] = (sim_clock.now - m['start_time']) / tournament.estimated_time(m)
+            if m['progress'] >= 1:
+                m['end_time'] = sim_clock.now
+                tournament.finish(m, outcome.winner(m, rng))
+                swiss_event.record(m['p1'], m['p2'], m['winner'])
+                view.mark_dirty([m['id']])
+                if log.matches:
+                    log.match(f"[MATCH DONE] Match {m['id']} (R{m['round']}) "
+                              f"{player_names[m['p1']]} vs {player_names[m['p2']]} "
+                              f"→ Winner: {player_names[m['winner']]} "
+                              f"in {m['end_time'] - m['start_time']:.1f} minutes")
+                if not tournament.running:
+                    state["next_round_at"] = sim_clock.now + round_break
+                    log.round(f"[ROUND DONE] R{state['round']} at {format_minutes(sim_clock.now)}")
+
+        # Pair and start the next round once the current one is done and the break is over
+        if not tournament.running and state["round"] < swiss_event.num_rounds \
+                and sim_clock.now >= state["next_round_at"]:
+            state["round"] += 1
+            start_round(state["round"])
+        return is_done()
+
+    def is_done():
+        return state["round"] == swiss_event.num_rounds and tournament.is_done()
+
+    def report():
+        log.summary("\n--- FINAL RANKING ---")
+        for i, player_id in enumerate(swiss_event.standings(), start=1):
+            log.summary(f"{i:2d}. {player_names[player_id]} "
+                        f"({swiss_event.score[player_id]} pts, Buchholz {swiss_event.buchholz[player_id]})")
+
+    app.run(tournament, step, is_done, report)
@@ -0,0 +1,163 @@
+# === Generated brackets ===
+# A source is where a match slot comes from: ('player', id), ('winner', match_id),
+# ('loser', match_id) or None for a bye.
+
+
+def seed_order(size):
+    # Standard seeding for a power-of-two bracket: 1 v size, 2 v size-1, top seeds meet last
+    order = [1]
+    while len(order) < size:
+        order = [s for seed in order for s in (seed, 2 * len(order) + 1 - seed)]
+    return order
+
+
+def _bracket_size(num_players):
+    size = 1
+    while size < num_players:
+        size *= 2
+    return size
+
+
+class _Builder:
+    def __init__(self):
+        self.matches = []
+
+    def slot_fields(self, slot, source):
+        kind, value = source
+        if kind == 'player':
+            return {slot + '_id': value}
+        return {slot + '_from': {'match': value, 'type': kind}}
+
+    def pair(self, a, b, round_num, bracket):
+        # Returns (winner source, loser source); a bye lets the other side through without a match
+        if a is None or b is None:
+            return a if b is None else b, None
+        match = {'id': len(self.matches) + 1, 'round': round_num, 'bracket': bracket}
+        match.update(self.slot_fields('p1', a))
+        match.update(self.slot_fields('p2', b))
+        self.matches.append(match)
+        return ('winner', match['id']), ('loser', match['id'])
+
+    def play_round(self, sources, round_num, bracket):
+        if len(sources) % 2:
+            sources = sources + [None]
+        results = [self.pair(sources[i], sources[i + 1], round_num, bracket) for i in range(0, len(sources), 2)]
+        return [w for w, _ in results], [l for _, l in results]
+
+
+def _first_round_sources(player_ids):
+    # player_ids are ordered by seed; seeds beyond the field are byes
+    size = _bracket_size(len(player_ids))
+    return [('player', player_ids[seed - 1]) if seed <= len(player_ids) else None for seed in seed_order(size)]
+
+
+def _ranking(final_id, matches, eliminating):
+    # Winner and loser of the final first, then the remaining eliminations from latest to earliest
+    later_first = [m['id'] for m in reversed(matches) if m['id'] in eliminating and m['id'] != final_id]
+    return [final_id, final_id] + later_first
+
+
+def single_elimination(player_ids):
+    builder = _Builder()
+    sources = _first_round_sources(player_ids)
+    round_num = 1
+    while len(sources) > 1:
+        sources, _ = builder.play_round(sources, round_num, 'WB')
+        round_num += 1
+
+    matches = builder.matches
+    final_id = matches[-1]['id'] if matches else None
+    return matches, _ranking(final_id, matches, {m['id'] for m in matches})
+
+
+def double_elimination(player_ids):
+    builder = _Builder()
+    wb = _first_round_sources(player_ids)
+    wb, dropped = builder.play_round(wb, 1, 'WB')
+    lb_round = 1
+
+    def play_lb(sources):
+        # Rounds that are all byes do not get a column of their own
+        nonlocal lb_round
+        before = len(builder.matches)
+        winners, _ = builder.play_round(sources, lb_round, 'LB')
+        if len(builder.matches) > before:
+            lb_round += 1
+        return winners
+
+    lb = play_lb(dropped)
+    wb_round = 2
+    while len(wb) > 1:
+        wb, dropped = builder.play_round(wb, wb_round, 'WB')
+        wb_round += 1
+        # Alternate the drop order so players do not meet the same opponent again straight away
+        if wb_round % 2:
+            dropped = dropped[::-1]
+        lb = play_lb([s for pair in zip(lb, dropped) for s in pair])
+        if len(lb) > 1:
+            lb = play_lb(lb)
+
+    lb_ids = {m['id'] for m in builder.matches if m['bracket'] == 'LB'}
+    builder.pair(wb[0], lb[0], wb_round, 'WB')
+
+    matches = builder.matches
+    final_id = matches[-1]['id'] if len(player_ids) > 1 else None
+    return matches, _ranking(final_id, matches, lb_ids)
+
+
+# === Unmatched pairing ===
+def generate_pairs(player_list):
+    # Neighbours play each other; the odd player out gets a bye and goes last in the next round
+    # (the rule the Unmatched batch and exact simulators use as well)
+    pairs, byes = [], []
+    for i in range(0, len(player_list), 2):
+        if i + 1 < len(player_list):
+            pairs.append((player_list[i], player_list[i + 1]))
+        else:
+            byes.append(player_list[i])
+    return pairs, byes
+
+
+# === Layout ===
+def layout(matches, x0=100, y0=50, spacing_x=240, spacing_y=100, bracket_gap=1.5):
+    # Column per round; a match sits level with the matches of its own bracket that feed it
+    by_id = {m['id']: m for m in matches}
+    columns = {}
+    for m in matches:
+        columns.setdefault((m.get('bracket', 'WB'), m['round']), []).append(m)
+
+    rows = {}
+    bracket_rows = {}
+    for (bracket, _), column in sorted(columns.items(), key=lambda item: item[0][1]):
+        desired = []
+        for m in column:
+            feeders = [rows[src['match']] for src in (m.get('p1_from'), m.get('p2_from'))
+                       if src and src['match'] in rows and by_id[src['match']].get('bracket', 'WB') == bracket]
+            desired.append(sum(feeders) / len(feeders) if feeders else None)
+
+        # Matches without feeders go below the others; then push rows apart so cards never overlap
+        known = [row for row in desired if row is not None]
+        free = max(known) + 1 if known else 0
+        placed = []
+        for m, row in zip(column, desired):
+            if row is None:
+                row, free = free, free + 1
+            placed.append((row, m['id']))
+        last = None
+        for row, match_id in sorted(placed):
+            row = row if last is None else max(row, last + 1)
+            rows[match_id] = last = row
+        bracket_rows[bracket] = max(bracket_rows.get(bracket, 0), last + 1)
+
+    # Brackets are stacked top to bottom in order of appearance
+    offsets = {}
+    offset = 0
+    for bracket in dict.fromkeys(m.get('bracket', 'WB') for m in matches):
+        offsets[bracket] = offset
+        offset += bracket_rows[bracket] + bracket_gap
+
+    return {
+        m['id']: (x0 + (m['round'] - 1) * spacing_x,
+                  y0 + int((offsets[m.get('bracket', 'WB')] + rows[m['id']]) * spacing_y))
+        for m in matches
+    }
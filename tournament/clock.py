@@ -0,0 +1,58 @@
+import time
+
+# Fixed simulation step: one simulated second (all sim times are in minutes)
+STEP_MINUTES = 1 / 60
+# Simulated seconds per wall second; None runs as fast as the frame budget allows
+SPEEDS = {"1x": 1, "60x": 60, "max": None}
+DEFAULT_CLOCK_SPEED = "60x"
+# Never catch up more than this much wall time at once (e.g. after the window was dragged)
+MAX_LAG = 0.25
+
+
+def format_minutes(minutes):
+    return f"{int(minutes // 60)} hours {int(minutes % 60)} minutes"
+
+
+# === Simulation clock ===
+class SimClock:
+    def __init__(self, speed=DEFAULT_CLOCK_SPEED, step=STEP_MINUTES, frame_budget=1 / 60, timer=time.perf_counter):
+        self.now = 0.0
+        self.step = step
+        self.frame_budget = frame_budget
+        self.timer = timer
+        self.accumulator = 0.0
+        self.last = None
+        self.set_speed(speed)
+
+    def set_speed(self, speed):
+        self.speed_name = speed
+        self.speed = SPEEDS[speed]
+        self.accumulator = 0.0
+
+    def advance(self, step_fn):
+        # Runs step_fn at every fixed step owed since the last frame; step_fn
+        # returns True to stop the clock where it is (e.g. tournament over)
+        wall = self.timer()
+        elapsed = 0.0 if self.last is None else min(wall - self.last, MAX_LAG)
+        self.last = wall
+
+        if self.speed is None:
+            deadline = wall + self.frame_budget
+            while True:
+                for _ in range(64):
+                    if step_fn():
+                        return
+                    self.now += self.step
+                if self.timer() >= deadline:
+                    return
+
+        self.accumulator += elapsed * self.speed / 60
+        while self.accumulator >= self.step:
+            self.accumulator -= self.step
+            if step_fn():
+                self.accumulator = 0.0
+                return
+            self.now += self.step
+
+    def label(self):
+        return f"{int(self.now // 60)}:{int(self.now % 60):02d} @ {self.speed_name}"
@@ -0,0 +1,145 @@
+import json
+
+BASE_MATCH_MINUTES = 30
+DEFAULT_SPEED = 1.0
+
+
+def load_json(path):
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+# === Match state ===
+class Tournament:
+    def __init__(self, matches, player_list):
+        self.matches = matches
+        self.players = {p['id']: p for p in player_list}
+        self.player_names = {p['id']: p['name'] for p in player_list}
+        # Track player routes
+        self.player_origin = {}
+
+        # Scheduler indexes: every event only touches the matches it affects
+        self.by_id = {}
+        self.order = {}
+        self.dependents = {}
+        self.busy = set()
+        self.running = {}
+        self.ready = set()
+        self.remaining = 0
+        self._init_matches(matches)
+
+    def add_matches(self, matches):
+        # Swiss rounds are only known once the previous round is over
+        self.matches.extend(matches)
+        self._init_matches(matches)
+
+    def _init_matches(self, matches):
+        for match in matches:
+            self.by_id[match['id']] = match
+            self.order[match['id']] = len(self.order)
+            self.dependents[match['id']] = []
+        self.remaining += len(matches)
+
+        for match in matches:
+            match['status'] = 'pending'
+            match['progress'] = 0
+            match['winner'] = None
+            match['p1'] = match.get('p1_id')
+            match['p2'] = match.get('p2_id')
+            for slot in ('p1', 'p2'):
+                src = match.get(slot + '_from')
+                if src and src['match'] in self.dependents:
+                    self.dependents[src['match']].append((match, slot))
+            self._mark_ready(match)
+
+    def get_match(self, match_id):
+        return self.by_id.get(match_id)
+
+    def _mark_ready(self, match):
+        if match['p1'] is not None and match['p2'] is not None and match['status'] == 'pending':
+            self.ready.add(match['id'])
+
+    def resolve_player(self, slot, match):
+        key = slot + '_from'
+        if match[slot] is None and key in match:
+            src = match[key]
+            origin = self.get_match(src['match'])
+            if origin and origin['status'] == 'done':
+                if src['type'] == 'winner':
+                    result = origin['winner']
+                else:
+                    result = self.loser(origin)
+                match[slot] = result
+                self.player_origin[result] = match['id']
+                self._mark_ready(match)
+
+    def can_start(self, match, busy_players):
+        self.resolve_player('p1', match)
+        self.resolve_player('p2', match)
+
+        if match['p1'] is None or match['p2'] is None:
+            return False
+        if match['p1'] in busy_players or match['p2'] in busy_players:
+            return False
+        if match['p1'] in self.player_origin and self.player_origin[match['p1']] != match['id']:
+            return False
+        if match['p2'] in self.player_origin and self.player_origin[match['p2']] != match['id']:
+            return False
+
+        return match['status'] == 'pending'
+
+    def startable(self):
+        # Matches that can start now, checked from the ready set instead of the whole bracket
+        busy = set(self.busy)
+        result = []
+        for match_id in sorted(self.ready, key=self.order.__getitem__):
+            match = self.by_id[match_id]
+            if self.can_start(match, busy):
+                busy.update((match['p1'], match['p2']))
+                result.append(match)
+        return result
+
+    def estimated_time(self, match):
+        # Match length in simulated minutes, faster players finish sooner
+        p1_speed = self.players.get(match['p1'], {}).get('speed', DEFAULT_SPEED)
+        p2_speed = self.players.get(match['p2'], {}).get('speed', DEFAULT_SPEED)
+        return BASE_MATCH_MINUTES / ((p1_speed + p2_speed) / 2)
+
+    def start(self, match):
+        match['status'] = 'running'
+        self.ready.discard(match['id'])
+        self.running[match['id']] = match
+        self.busy.update((match['p1'], match['p2']))
+
+    def finish(self, match, winner):
+        match['status'] = 'done'
+        match['progress'] = 1
+        match['winner'] = winner
+        self.player_origin[winner] = match['id']
+        self.ready.discard(match['id'])
+        self.running.pop(match['id'], None)
+        self.busy.difference_update((match['p1'], match['p2']))
+        self.remaining -= 1
+        # Winner and loser move on to the matches that wait for them
+        for dependent, slot in self.dependents[match['id']]:
+            self.resolve_player(slot, dependent)
+
+    @staticmethod
+    def loser(match):
+        return match['p1'] if match['p2'] == match['winner'] else match['p2']
+
+    def is_done(self):
+        return self.remaining == 0
+
+    def ranking(self, ranking_order):
+        # Final places: the first match in the order gives its winner, every other match its loser
+        places = []
+        for i, match_id in enumerate(ranking_order):
+            match = self.get_match(match_id)
+            if not match:
+                places.append(None)
+            elif i == 0:
+                places.append(match['winner'])
+            else:
+                places.append(self.loser(match))
+        return places
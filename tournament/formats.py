@@ -0,0 +1,47 @@
+import os
+
+from .bracket import double_elimination, single_elimination
+from .core import load_json
+from .rng import RandomStream
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PLAYERS_PATH = os.path.join(ROOT_DIR, "players.json")
+
+# === Built-in tournament formats ===
+FORMATS = {
+    "single": {
+        "matches": os.path.join(ROOT_DIR, "single_elimination", "single_elimination_matches.json"),
+        "ranking_order": list(range(11, 0, -1)),
+    },
+    "double": {
+        "matches": os.path.join(ROOT_DIR, "double_elimination", "double_elimination_matches.json"),
+        "ranking_order": [22, 22, 21, 19, 17, 18, 14, 13, 12, 11, 10, 9],
+    },
+    "swiss": {
+        "matches": os.path.join(ROOT_DIR, "swiss", "swiss_matches.json"),
+        # Rounds start together, with a break between them
+        "round_break": 15,
+    },
+}
+
+
+# === Match graphs ===
+GENERATORS = {
+    "single": single_elimination,
+    "double": double_elimination,
+}
+
+
+def synthetic_players(num_players, rng=None):
+    # Same shape as players.json, with speeds in the range of the demo field
+    rng = rng or RandomStream()
+    return [{"id": i, "name": f"Player_{i}", "speed": round(rng.uniform(0.8, 1.4), 2)}
+            for i in range(1, num_players + 1)]
+
+
+def build_format(name, player_list, generate=False):
+    # Returns (matches, ranking_order): the handwritten demo bracket, or one generated for player_list
+    fmt = FORMATS[name]
+    if generate and name in GENERATORS:
+        return GENERATORS[name]([p['id'] for p in player_list])
+    return load_json(fmt['matches']), fmt.get('ranking_order')
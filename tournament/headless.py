@@ -0,0 +1,91 @@
+import heapq
+
+from .core import load_json
+from .formats import PLAYERS_PATH, synthetic_players
+from .outcomes import OUTCOMES, CoinFlip, win_matrix
+from .rng import DEFAULT_BIT_GENERATOR, RandomStream
+
+
+def _trigger(match, finished):
+    # The finish that let this match start: a match it waited on for a player, else the one that freed a table
+    players = (match['p1'], match['p2'])
+    for m in finished:
+        if m['p1'] in players or m['p2'] in players:
+            return m['id']
+    return finished[0]['id'] if finished else None
+
+
+# === Discrete-event simulation ===
+def run_headless(tournament, rng=None, tables=None, policy=None, outcome=None):
+    # Same dependency rules as the visual run_sim, but time jumps straight to the next match end.
+    # At most `tables` matches are played at once (None = no limit); policy(tournament) gives the sort key
+    # of the ready matches when there are more than free tables (None = bracket order)
+    outcome = outcome or CoinFlip()
+    rng = rng or RandomStream()
+    key = policy(tournament) if policy else None
+    now = 0.0
+    finish_queue = []
+    finished = []
+    while not tournament.is_done():
+        free = None if tables is None else tables - len(tournament.running)
+        if free is None or free > 0:
+            ready = sorted(tournament.startable(), key=key) if key else tournament.startable()
+            for m in ready[:free]:
+                tournament.start(m)
+                m['start_time'] = now
+                m['end_time'] = now + tournament.estimated_time(m)
+                m['after'] = _trigger(m, finished)
+                heapq.heappush(finish_queue, (m['end_time'], tournament.order[m['id']], m['id']))
+
+        if not finish_queue:
+            raise RuntimeError("no match can start, check the p1_from/p2_from structure")
+
+        now = finish_queue[0][0]
+        finished = []
+        while finish_queue and finish_queue[0][0] <= now:
+            m = tournament.get_match(heapq.heappop(finish_queue)[2])
+            tournament.finish(m, outcome.winner(m, rng))
+            finished.append(m)
+    return now
+
+
+def run_rounds(tournament, next_round, rng=None, tables=None, policy=None, round_break=0, on_finish=None,
+               outcome=None):
+    # Swiss style: every round waits for the previous one and the break; inside a round the matches
+    # queue for the tables. next_round() returns the next round's matches or None, on_finish(match)
+    # sees every result (e.g. to update the standings the next round is paired from)
+    outcome = outcome or CoinFlip()
+    rng = rng or RandomStream()
+    now = 0.0
+    last = None
+    while True:
+        round_matches = next_round()
+        if not round_matches:
+            break
+        key = policy(tournament) if policy else None
+        free_at = [(now, last)] * min(tables or len(round_matches), len(round_matches))
+        for m in sorted(round_matches, key=key) if key else round_matches:
+            start, m['after'] = heapq.heappop(free_at)
+            tournament.start(m)
+            m['start_time'] = start
+            m['end_time'] = start + tournament.estimated_time(m)
+            tournament.finish(m, outcome.winner(m, rng))
+            if on_finish:
+                on_finish(m)
+            heapq.heappush(free_at, (m['end_time'], m['id']))
+        end, last = max((m['end_time'], m['id']) for m in round_matches)
+        now = end + round_break
+    return now - round_break
+
+
+# === Champion chances ===
+def champion_shares(name, runs, seed=None, num_players=None, outcome="coin", bit_generator=DEFAULT_BIT_GENERATOR):
+    # Share of the runs each player wins, from the vectorized batch simulator on the outcome's win matrix;
+    # brackets are generated for the field, with a new random seeding every run. [(player, share)], best first
+    from .batch import BATCH_SIZE, simulate_counts
+
+    rng = RandomStream(seed, bit_generator)
+    player_list = synthetic_players(num_players, rng) if num_players else load_json(PLAYERS_PATH)
+    W = win_matrix(OUTCOMES[outcome](player_list), [p['id'] for p in player_list])
+    counts = simulate_counts(W, runs, BATCH_SIZE, seed, fmt=name, bit_generator=bit_generator)
+    return sorted(zip(player_list, (counts / runs).tolist()), key=lambda item: -item[1])
@@ -0,0 +1,127 @@
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb():
+    # Peak resident set size of this process and of finished worker processes (None where unsupported)
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    scale = 1 / 1024 ** 2 if sys.platform == "darwin" else 1 / 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale
+    return round(own, 1), round(children, 1)
+
+
+# === Per-phase timing ===
+_NO_PHASE = nullcontext()
+
+
+# Opt-in: a disabled Instrument hands out one shared no-op context, so the
+# phase() calls can stay in the hot loops.
+class Instrument:
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.phases = {}
+        self.counters = {}
+        self.start = time.perf_counter()
+        self.start_cpu = time.process_time()
+        self.start_children = self._children_cpu()
+
+    @staticmethod
+    def _children_cpu():
+        # CPU time of finished worker processes
+        times = os.times()
+        return times.children_user + times.children_system
+
+    def phase(self, name):
+        return self._phase(name) if self.enabled else _NO_PHASE
+
+    @contextmanager
+    def _phase(self, name):
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            totals = self.phases.setdefault(name, [0.0, 0.0, 0])
+            totals[0] += time.perf_counter() - wall
+            totals[1] += time.process_time() - cpu
+            totals[2] += 1
+
+    def iterate(self, iterable, name):
+        # Times the work done inside the iterator (e.g. a generator of simulated batches)
+        iterator = iter(iterable)
+        while True:
+            with self.phase(name):
+                item = next(iterator, StopIteration)
+            if item is StopIteration:
+                return
+            yield item
+
+    def count(self, name, amount):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def report(self):
+        wall = time.perf_counter() - self.start
+        rss = peak_rss_mb()
+        return {
+            "wall": wall,
+            "cpu": time.process_time() - self.start_cpu,
+            "cpu_workers": self._children_cpu() - self.start_children,
+            "phases": {name: {"wall": w, "cpu": c, "calls": calls} for name, (w, c, calls) in self.phases.items()},
+            "counters": self.counters,
+            # Throughput over the whole run, e.g. tournaments per second
+            "rates": {name: amount / wall for name, amount in self.counters.items()} if wall else {},
+            "peak_rss_mb": rss[0] if rss else None,
+            "peak_rss_children_mb": rss[1] if rss else None,
+        }
+
+    def lines(self, report):
+        workers = f" + {report['cpu_workers']:.2f}s in workers" if report['cpu_workers'] else ""
+        yield f"\n--- Instrumentation ({report['wall']:.2f}s wall, {report['cpu']:.2f}s CPU{workers}) ---"
+        for name, phase in report["phases"].items():
+            yield (f"{name:<12}{phase['wall']:>9.3f}s wall{phase['cpu']:>9.3f}s CPU"
+                   f"{phase['wall'] / report['wall'] * 100:>7.1f}%  ({phase['calls']} calls)")
+        for name, rate in report["rates"].items():
+            yield f"{name}: {self.counters[name]:,} ({rate:,.0f}/s)"
+        if report["peak_rss_mb"] is not None:
+            yield f"peak RSS: {report['peak_rss_mb']:.1f} MB (workers {report['peak_rss_children_mb']:.1f} MB)"
+
+    def write(self, log_dir, name="instrumentation.json"):
+        # Writes the JSON report into log_dir and returns it
+        report = self.report()
+        os.makedirs(log_dir, exist_ok=True)
+        with open(os.path.join(log_dir, name), "w") as f:
+            json.dump(report, f, indent=2)
+        return report
+
+
+# === cProfile capture ===
+@contextmanager
+def profile(log_dir, enabled=True, top=30):
+    # Profiles the block into log_dir/profile.prof (for snakeviz, pstats) and a profile.txt of the top functions
+    if not enabled:
+        yield
+        return
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        os.makedirs(log_dir, exist_ok=True)
+        profiler.dump_stats(os.path.join(log_dir, "profile.prof"))
+        with open(os.path.join(log_dir, "profile.txt"), "w") as f:
+            pstats.Stats(profiler, stream=f).sort_stats("cumulative").print_stats(top)
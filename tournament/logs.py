@@ -0,0 +1,110 @@
+import os
+import queue
+import sys
+import threading
+
+# === Verbosity ===
+SUMMARY, ROUND, MATCH = 0, 1, 2
+LEVELS = {"summary": SUMMARY, "round": ROUND, "match": MATCH}
+# Lines are handed to the sinks in chunks of about this many characters
+BUFFER_SIZE = 1 << 16
+
+
+# === Background file writer ===
+# Takes the file writes off the simulation thread; flush() waits until everything is on disk
+class BackgroundWriter:
+    def __init__(self, f):
+        self.file = f
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while True:
+            data = self.queue.get()
+            if data is None:
+                self.file.flush()
+                self.queue.task_done()
+                return
+            self.file.write(data)
+            self.queue.task_done()
+
+    def write(self, data):
+        self.queue.put(data)
+
+    def flush(self):
+        self.queue.join()
+        self.file.flush()
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join()
+        self.file.close()
+
+
+# === Buffered log ===
+# One line per call, collected in memory and written to every sink in large chunks.
+# Callers check log.matches / log.rounds before building a message, so a disabled
+# level costs one attribute lookup.
+class Log:
+    def __init__(self, level=SUMMARY, sinks=(), buffer_size=BUFFER_SIZE):
+        self.level = LEVELS.get(level, level)
+        self.matches = self.level >= MATCH
+        self.rounds = self.level >= ROUND
+        self.sinks = list(sinks)
+        self.buffer_size = buffer_size
+        self.lines = []
+        self.size = 0
+
+    def write(self, line=""):
+        self.lines.append(line)
+        self.size += len(line) + 1
+        if self.size >= self.buffer_size:
+            self._drain()
+
+    def match(self, line):
+        if self.matches:
+            self.write(line)
+
+    def round(self, line):
+        if self.rounds:
+            self.write(line)
+
+    # Summary lines are always written
+    summary = write
+
+    def _drain(self):
+        if self.lines:
+            chunk = "\n".join(self.lines) + "\n"
+            for sink in self.sinks:
+                sink.write(chunk)
+            self.lines = []
+            self.size = 0
+
+    def flush(self):
+        self._drain()
+        for sink in self.sinks:
+            sink.flush()
+
+    def close(self):
+        self.flush()
+        for sink in self.sinks:
+            if sink not in (sys.stdout, sys.__stdout__):
+                sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_log(log_dir=None, level=SUMMARY, name="summary.txt", background=False, console=True, append=False):
+    # Console and/or log_dir/name (overwritten on every run, unless append, e.g. when resuming);
+    # background=True writes the file from a thread
+    sinks = [sys.stdout] if console else []
+    if log_dir is not None:
+        os.makedirs(log_dir, exist_ok=True)
+        f = open(os.path.join(log_dir, name), "a" if append else "w", encoding="utf-8")
+        sinks.append(BackgroundWriter(f) if background else f)
+    return Log(level, sinks)
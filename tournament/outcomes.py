@@ -0,0 +1,55 @@
+from .core import DEFAULT_SPEED
+
+
+# === Outcome models ===
+# A model decides who wins a match. p1_wins(p1, p2) is the chance that the
+# first player wins, so any model can also fill the W matrix of the batch simulator.
+class CoinFlip:
+    def p1_wins(self, p1, p2):
+        return 0.5
+
+    def winner(self, match, rng):
+        # One uniform from the stream, like the other models
+        return rng.choice([match['p1'], match['p2']])
+
+
+class SpeedModel:
+    # Faster players win more often: P(p1 wins) = s1 / (s1 + s2)
+    def __init__(self, player_list):
+        self.speed = {p['id']: p.get('speed', DEFAULT_SPEED) for p in player_list}
+
+    def p1_wins(self, p1, p2):
+        return self.speed[p1] / (self.speed[p1] + self.speed[p2])
+
+    def winner(self, match, rng):
+        return match['p1'] if rng.random() < self.p1_wins(match['p1'], match['p2']) else match['p2']
+
+
+class MatrixModel:
+    # Head-to-head win rates, e.g. the Unmatched matchup table: W[i][j] is the chance that ids[i] beats ids[j]
+    def __init__(self, ids, W):
+        self.index = {pid: i for i, pid in enumerate(ids)}
+        self.W = W
+        self.rows = W.tolist() if hasattr(W, 'tolist') else W
+
+    def p1_wins(self, p1, p2):
+        return self.rows[self.index[p1]][self.index[p2]]
+
+    def winner(self, match, rng):
+        return match['p1'] if rng.random() < self.p1_wins(match['p1'], match['p2']) else match['p2']
+
+
+OUTCOMES = {
+    "coin": lambda player_list: CoinFlip(),
+    "speed": SpeedModel,
+}
+
+
+def win_matrix(model, player_ids):
+    # W for tournament.batch, in player_ids order
+    import numpy as np
+
+    if isinstance(model, MatrixModel):
+        idx = [model.index[p] for p in player_ids]
+        return np.asarray(model.W, dtype=float)[np.ix_(idx, idx)]
+    return np.array([[model.p1_wins(a, b) if a != b else 0.5 for b in player_ids] for a in player_ids])
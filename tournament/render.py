@@ -0,0 +1,132 @@
+import pygame
+
+BACKGROUND = (25, 25, 25)
+PROGRESS_COLOR = (0, 255, 0)
+CELL_SIZE = 512
+SCROLL_SPEED = 20
+
+
+# font.render is the most expensive call per frame and the same (text, color)
+# pairs come up over and over, so the surfaces are kept
+class TextCache:
+    def __init__(self, font):
+        self.font = font
+        self.surfaces = {}
+
+    def render(self, text, color):
+        key = (text, color)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = self.surfaces[key] = self.font.render(text, True, color)
+        return surface
+
+
+# Match cards with dirty-region updates. draw_card(surface, match, x, y, text)
+# paints the static part of a card (everything but the progress bar) and is
+# cached per card_key(match), so a card is rendered once per state change and
+# blitted afterwards. Only dirty cards inside the viewport are redrawn, and
+# only their rects are pushed to the display.
+class BracketView:
+    def __init__(self, screen, font, card_width, card_height, draw_card, card_key,
+                 title_height=0, background=BACKGROUND, margin=100):
+        self.screen = screen
+        self.text = TextCache(font)
+        self.card_width = card_width
+        self.card_height = card_height
+        self.draw_card = draw_card
+        self.card_key = card_key
+        self.title_height = title_height
+        self.background = background
+        self.margin = margin
+        self.cards = {}
+        self.reset()
+
+    def reset(self, coords=None):
+        self.coords = {}
+        self.grid = {}
+        self.width = self.height = 0
+        self.scroll_x = self.scroll_y = 0
+        self.dirty = set()
+        self.visible = set()
+        self.full_redraw = True
+        if coords:
+            self.add(coords)
+
+    def add(self, coords):
+        # Spatial hash: each card is registered in every cell it overlaps
+        for match_id, (x, y) in coords.items():
+            self.coords[match_id] = (x, y)
+            top = y - self.title_height
+            for cx in range(x // CELL_SIZE, (x + self.card_width) // CELL_SIZE + 1):
+                for cy in range(top // CELL_SIZE, (y + self.card_height) // CELL_SIZE + 1):
+                    self.grid.setdefault((cx, cy), []).append(match_id)
+            self.width = max(self.width, x + self.card_width + self.margin)
+            self.height = max(self.height, y + self.card_height + self.margin)
+        self.full_redraw = True
+
+    def scroll(self, dx, dy):
+        screen_w, screen_h = self.screen.get_size()
+        scroll_x = min(0, max(self.scroll_x + dx, screen_w - self.width))
+        scroll_y = min(0, max(self.scroll_y + dy, screen_h - self.height))
+        if (scroll_x, scroll_y) != (self.scroll_x, self.scroll_y):
+            self.scroll_x, self.scroll_y = scroll_x, scroll_y
+            self.full_redraw = True
+
+    def wheel(self, event, speed=SCROLL_SPEED):
+        # Mouse wheel scrolls vertically, shift + wheel horizontally
+        if pygame.key.get_mods() & pygame.KMOD_SHIFT:
+            self.scroll(event.y * speed, 0)
+        else:
+            self.scroll(0, event.y * speed)
+
+    def mark_dirty(self, match_ids):
+        self.dirty.update(match_ids)
+
+    def _visible_ids(self):
+        screen_w, screen_h = self.screen.get_size()
+        left, top = -self.scroll_x, -self.scroll_y
+        visible = set()
+        for cx in range(left // CELL_SIZE, (left + screen_w) // CELL_SIZE + 1):
+            for cy in range(top // CELL_SIZE, (top + screen_h) // CELL_SIZE + 1):
+                visible.update(self.grid.get((cx, cy), ()))
+        return visible
+
+    def _card(self, match):
+        key = self.card_key(match)
+        surface = self.cards.get(key)
+        if surface is None:
+            surface = pygame.Surface((self.card_width, self.card_height + self.title_height), pygame.SRCALPHA)
+            self.draw_card(surface, match, 0, self.title_height, self.text)
+            self.cards[key] = surface
+        return surface
+
+    def _draw(self, match):
+        x, y = self.coords[match['id']]
+        x += self.scroll_x
+        y += self.scroll_y
+        rect = pygame.Rect(x, y - self.title_height, self.card_width, self.card_height + self.title_height)
+        self.screen.fill(self.background, rect)
+        self.screen.blit(self._card(match), rect.topleft)
+        if match.get('status') == 'running':
+            prog_width = int(self.card_width * min(match['progress'], 1))
+            pygame.draw.rect(self.screen, PROGRESS_COLOR, (x, y + self.card_height - 6, prog_width, 5))
+        return rect
+
+    def draw(self, by_id):
+        if self.full_redraw:
+            self.visible = self._visible_ids()
+            self.screen.fill(self.background)
+            for match_id in self.visible:
+                self._draw(by_id[match_id])
+            pygame.display.flip()
+            self.full_redraw = False
+            self.dirty.clear()
+            return
+
+        # Idle frames (nothing changed) touch neither the surface nor the display
+        if not self.dirty:
+            return
+        rects = [self._draw(by_id[match_id]) for match_id in self.dirty & self.visible]
+        self.dirty.clear()
+        if rects:
+            pygame.display.update(rects)
@@ -0,0 +1,61 @@
+from itertools import chain
+
+# === Bit generators ===
+# numpy.random classes by option name. PCG64 is numpy's default; Philox is counter based,
+# for runs split across many workers. numpy is imported on first use, so importing the
+# tournament package stays light.
+BIT_GENERATORS = {"pcg64": "PCG64", "philox": "Philox"}
+DEFAULT_BIT_GENERATOR = "pcg64"
+# Uniforms a RandomStream draws per refill
+BLOCK_SIZE = 4096
+
+
+def generator(seed=None, bit_generator=DEFAULT_BIT_GENERATOR):
+    # numpy Generator for a master seed (int or None) or a spawned SeedSequence;
+    # with PCG64 this is the same stream as np.random.default_rng(seed)
+    import numpy as np
+
+    return np.random.Generator(getattr(np.random, BIT_GENERATORS[bit_generator])(seed))
+
+
+def fresh_seed():
+    # Random master seed that can be stored and passed back later (e.g. in a checkpoint)
+    import numpy as np
+
+    return np.random.SeedSequence().entropy
+
+
+def substreams(seed, count):
+    # Independent child seeds of one master seed, one per batch or worker
+    import numpy as np
+
+    return np.random.SeedSequence(seed).spawn(count)
+
+
+# === Buffered stream for the per-match Python loops ===
+# Answers the calls the scripts made on the random module (random, uniform, randint, choice, shuffle)
+# from blocks of uniforms the Generator draws in bulk, so a match costs a list lookup, not a numpy call.
+# The same seed and bit generator always give the same draws.
+class RandomStream:
+    def __init__(self, seed=None, bit_generator=DEFAULT_BIT_GENERATOR, block_size=BLOCK_SIZE):
+        self.generator = generator(seed, bit_generator)
+        # random(): uniform in [0, 1) with full double resolution. The next block is drawn
+        # when the last one runs out; chain's __next__ keeps the call in C.
+        blocks = iter(lambda: self.generator.random(block_size).tolist(), None)
+        self.random = chain.from_iterable(blocks).__next__
+
+    def uniform(self, a, b):
+        return a + (b - a) * self.random()
+
+    def randint(self, a, b):
+        # Integer in [a, b], both ends included, like random.randint
+        return a + int(self.random() * (b - a + 1))
+
+    def choice(self, seq):
+        return seq[int(self.random() * len(seq))]
+
+    def shuffle(self, items):
+        # Fisher-Yates in place
+        for i in range(len(items) - 1, 0, -1):
+            j = int(self.random() * (i + 1))
+            items[i], items[j] = items[j], items[i]
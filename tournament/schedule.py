@@ -0,0 +1,134 @@
+import statistics
+from collections import Counter
+
+from .core import Tournament, load_json
+from .formats import FORMATS, PLAYERS_PATH, build_format, synthetic_players
+from .headless import run_headless, run_rounds
+from .instrument import Instrument
+from .outcomes import OUTCOMES
+from .rng import DEFAULT_BIT_GENERATOR, RandomStream
+from .swiss import SwissEvent, live_rounds
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+# === Scheduling policies ===
+# A policy gets the tournament and returns a sort key; when there are more
+# matches ready than free tables, the ones that sort first get the tables.
+# The sort is stable, so ties keep bracket order.
+def bracket_order(tournament):
+    return lambda match: 0
+
+
+def longest_first(tournament):
+    return lambda match: -tournament.estimated_time(match)
+
+
+def shortest_first(tournament):
+    return tournament.estimated_time
+
+
+def critical_path_first(tournament):
+    # Longest chain of expected match times from this match to the end of the bracket
+    tails = {}
+
+    def tail(match):
+        if match['id'] not in tails:
+            after = [tail(dependent) for dependent, _ in tournament.dependents[match['id']]]
+            tails[match['id']] = tournament.estimated_time(match) + max(after, default=0)
+        return tails[match['id']]
+
+    return lambda match: -tail(match)
+
+
+POLICIES = {
+    "bracket": bracket_order,
+    "longest": longest_first,
+    "shortest": shortest_first,
+    "critical": critical_path_first,
+}
+
+
+# === Critical path ===
+def critical_path(tournament):
+    # Follows the start triggers back from the match that finished last
+    match = max(tournament.matches, key=lambda m: m['end_time'])
+    path = []
+    while match is not None:
+        path.append(match)
+        match = tournament.get_match(match['after']) if match['after'] is not None else None
+    return path[::-1]
+
+
+def _swiss_rounds(tournament, player_list, live):
+    # Round source for run_rounds: live pairing from the standings, or the rounds in the JSON file
+    if live:
+        return live_rounds(SwissEvent([p['id'] for p in player_list]), tournament)
+
+    rounds = iter(sorted({m['round'] for m in tournament.matches}))
+
+    def next_round():
+        round_num = next(rounds, None)
+        return [m for m in tournament.matches if m['round'] == round_num] if round_num else None
+
+    return next_round, None
+
+
+# === Estimates over many events ===
+def estimate_format(name, runs, tables=None, policy="bracket", seed=None, num_players=None, generate=False,
+                    outcome="coin", instrument=None, bit_generator=DEFAULT_BIT_GENERATOR):
+    instrument = instrument or Instrument(enabled=False)
+    rng = RandomStream(seed, bit_generator)
+    with instrument.phase("setup"):
+        player_list = synthetic_players(num_players, rng) if num_players else load_json(PLAYERS_PATH)
+        model = OUTCOMES[outcome](player_list)
+        round_break = FORMATS[name].get('round_break')
+        live_swiss = name == "swiss" and (generate or bool(num_players))
+        matches = [] if live_swiss else build_format(name, player_list, generate or bool(num_players))[0]
+
+    durations, busy, peaks = [], [], []
+    on_path = Counter()
+    labels = {}
+    for _ in range(runs):
+        with instrument.phase("simulate"):
+            tournament = Tournament([dict(m) for m in matches], player_list)
+            if round_break is None:
+                duration = run_headless(tournament, rng, tables, POLICIES[policy], model)
+            else:
+                next_round, on_finish = _swiss_rounds(tournament, player_list, live_swiss)
+                duration = run_rounds(tournament, next_round, rng, tables, POLICIES[policy], round_break,
+                                      on_finish, model)
+        instrument.count("tournaments", 1)
+        instrument.count("matches", len(tournament.matches))
+        with instrument.phase("stats"):
+            durations.append(duration)
+            busy.append(sum(m['end_time'] - m['start_time'] for m in tournament.matches))
+            peaks.append(peak_tables(tournament.matches))
+            for m in critical_path(tournament):
+                on_path[m['id']] += 1
+                labels[m['id']] = f"{m['bracket']} R{m['round']}" if 'bracket' in m else f"R{m['round']}"
+
+    # Utilization of the tables the venue has, or of the most the event ever used when there is no limit
+    capacity = [tables or peak for peak in peaks]
+    cuts = statistics.quantiles(durations, n=100) if runs > 1 else [durations[0]] * 99
+    return {
+        "runs": runs,
+        "tables": tables,
+        "policy": policy,
+        "outcome": outcome,
+        "mean": statistics.mean(durations),
+        "percentiles": {p: cuts[p - 1] for p in PERCENTILES},
+        "utilization": statistics.mean(b / (c * d) for b, c, d in zip(busy, capacity, durations)),
+        "peak_tables": max(peaks),
+        "critical_path": [(match_id, labels[match_id], count / runs) for match_id, count in on_path.most_common()],
+    }
+
+
+def peak_tables(matches):
+    events = sorted([(m['start_time'], 1) for m in matches] + [(m['end_time'], -1) for m in matches],
+                    key=lambda e: (e[0], e[1]))
+    peak = playing = 0
+    for _, change in events:
+        playing += change
+        peak = max(peak, playing)
+    return peak
@@ -0,0 +1,158 @@
+import math
+
+from .core import Tournament
+from .headless import run_rounds
+
+
+# === Swiss pairing ===
+class SwissEvent:
+    def __init__(self, player_ids, num_rounds=None):
+        self.player_ids = list(player_ids)
+        self.seed = {p: i for i, p in enumerate(self.player_ids)}
+        self.num_rounds = num_rounds or max(1, math.ceil(math.log2(max(len(self.player_ids), 2))))
+        self.round = 0
+        self.score = dict.fromkeys(self.player_ids, 0)
+        # Buchholz (sum of opponents' scores) is kept up to date on every result
+        self.buchholz = dict.fromkeys(self.player_ids, 0)
+        self.opponents = {p: [] for p in self.player_ids}
+        self.played = set()
+        self.had_bye = set()
+
+    def _rank_key(self, player):
+        return -self.score[player], -self.buchholz[player], self.seed[player]
+
+    def standings(self):
+        return sorted(self.player_ids, key=self._rank_key)
+
+    def has_played(self, p1, p2):
+        return (min(p1, p2), max(p1, p2)) in self.played
+
+    def pair_round(self):
+        # Returns (pairs, bye player or None) for the next round
+        order = self.standings()
+        bye = None
+        if len(order) % 2:
+            bye = next((p for p in reversed(order) if p not in self.had_bye), order[-1])
+            order.remove(bye)
+
+        pairs = pair_standings(order, self.has_played)
+
+        self.round += 1
+        if bye is not None:
+            self.had_bye.add(bye)
+            self._add_points(bye, 1)
+        return pairs, bye
+
+    def record(self, p1, p2, winner):
+        self.played.add((min(p1, p2), max(p1, p2)))
+        self.opponents[p1].append(p2)
+        self.opponents[p2].append(p1)
+        self.buchholz[p1] += self.score[p2]
+        self.buchholz[p2] += self.score[p1]
+        self._add_points(winner, 1)
+
+    def _add_points(self, player, points):
+        self.score[player] += points
+        for opponent in self.opponents[player]:
+            self.buchholz[opponent] += points
+
+    def round_matches(self, pairs, start_id):
+        return [{'id': start_id + i, 'round': self.round, 'p1_id': p1, 'p2_id': p2}
+                for i, (p1, p2) in enumerate(pairs)]
+
+
+def pair_standings(order, has_played):
+    # Pairs for players in standings order (even count): greedy first, repaired if it gets stuck
+    pairs, leftover = _greedy(order, has_played)
+    if leftover:
+        pairs = _repair(order, pairs, leftover, has_played)
+    return pairs
+
+
+def _greedy(order, has_played):
+    # Walk down the standings: everyone meets the nearest player below them they have not played yet,
+    # so pairs stay inside a score group and only float down when the group runs out
+    taken = [False] * len(order)
+    pairs = []
+    for i, p in enumerate(order):
+        if taken[i]:
+            continue
+        taken[i] = True
+        for j in range(i + 1, len(order)):
+            if not taken[j] and not has_played(p, order[j]):
+                taken[j] = True
+                pairs.append((p, order[j]))
+                break
+        else:
+            return pairs, [q for q, t in zip(order, taken) if not t] + [p]
+    return pairs, []
+
+
+def _repair(order, pairs, leftover, has_played):
+    # Re-pair the bottom of the standings as a matching problem, widening the window until it works
+    rank = {p: i for i, p in enumerate(order)}
+    window = 1
+    while True:
+        window = min(window, len(pairs))
+        players = leftover + [p for pair in pairs[len(pairs) - window:] for p in pair]
+        repaired = _match_without_rematches(sorted(players, key=rank.__getitem__), rank, has_played)
+        if repaired is not None:
+            return pairs[:len(pairs) - window] + repaired
+        if window == len(pairs):
+            # Every pairing needs a rematch: allow it rather than stall the event
+            return [(order[i], order[i + 1]) for i in range(0, len(order), 2)]
+        window *= 2
+
+
+def _match_without_rematches(players, rank, has_played):
+    # Weighted matching that prefers close standings; pure backtracking when networkx is not installed
+    try:
+        import networkx as nx
+    except ImportError:
+        return _backtrack(players, has_played)
+
+    graph = nx.Graph()
+    size = len(players)
+    for i, p in enumerate(players):
+        for q in players[i + 1:]:
+            if not has_played(p, q):
+                graph.add_edge(p, q, weight=size * size - (rank[p] - rank[q]) ** 2)
+    matching = nx.max_weight_matching(graph, maxcardinality=True)
+    if 2 * len(matching) < size:
+        return None
+    return sorted(((p, q) if rank[p] < rank[q] else (q, p) for p, q in matching), key=lambda pair: rank[pair[0]])
+
+
+def _backtrack(players, has_played):
+    if not players:
+        return []
+    first, rest = players[0], players[1:]
+    for i, q in enumerate(rest):
+        if not has_played(first, q):
+            tail = _backtrack(rest[:i] + rest[i + 1:], has_played)
+            if tail is not None:
+                return [(first, q)] + tail
+    return None
+
+
+# === Headless Swiss event ===
+def live_rounds(event, tournament):
+    # (next_round, on_finish) for run_rounds: every round is paired from the current standings
+    def next_round():
+        if event.round == event.num_rounds:
+            return None
+        pairs, _ = event.pair_round()
+        round_matches = event.round_matches(pairs, len(tournament.matches) + 1)
+        tournament.add_matches(round_matches)
+        return round_matches
+
+    return next_round, lambda m: event.record(m['p1'], m['p2'], m['winner'])
+
+
+def run_swiss(player_list, rng=None, round_break=0, num_rounds=None, outcome=None):
+    # Pairs every round from the current standings; returns (duration in minutes, event)
+    event = SwissEvent([p['id'] for p in player_list], num_rounds)
+    tournament = Tournament([], player_list)
+    next_round, on_finish = live_rounds(event, tournament)
+    return run_rounds(tournament, next_round, rng, round_break=round_break, on_finish=on_finish,
+                      outcome=outcome), event
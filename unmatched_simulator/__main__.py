@@ -0,0 +1,18 @@
+import runpy
+import sys
+
+# python unmatched_simulator <command> [options] runs one of the scripts from any working directory
+COMMANDS = {
+    "sim": "sim",
+    "gui": "main",
+    "markov": "markov_chain",
+    "incremental": "incremental",
+    "summary": "summary",
+}
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] not in COMMANDS:
+        sys.exit(f"usage: python unmatched_simulator {{{','.join(COMMANDS)}}} [options]")
+    module = COMMANDS[sys.argv[1]]
+    sys.argv = [f"{module}.py"] + sys.argv[2:]
+    runpy.run_module(module, run_name="__main__", alter_sys=True)
@@ -0,0 +1,60 @@
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+
+# Seconds between checkpoints of a long run
+CHECKPOINT_EVERY = 60.0
+
+
+# === Run identity ===
+def config_hash(config, *tables):
+    # Everything that changes the results: the run options and the raw matchup tables. Not the win matrix
+    # alone: its 50/50 fallback hides changes in thin cells that --bayes samples from
+    digest = hashlib.sha256(json.dumps(config, sort_keys=True).encode())
+    for table in tables:
+        digest.update(np.ascontiguousarray(table, dtype=float).tobytes())
+    return digest.hexdigest()
+
+
+# === Periodic checkpoints ===
+# Saved at batch boundaries as a small .npz. Every batch draws from its own substream of the
+# master seed, so the RNG state is the seed plus the number of finished batches.
+class Checkpoint:
+    def __init__(self, path, config_hash, every=CHECKPOINT_EVERY, summary_path=None):
+        self.path = path
+        self.hash = config_hash
+        self.every = every
+        # Log file whose size is saved too, so a resumed run can cut it back and append
+        self.summary_path = summary_path
+        self.last = time.monotonic()
+
+    def load(self):
+        # State saved by the same run, None if there is none
+        if not os.path.exists(self.path):
+            return None
+        with np.load(self.path) as saved:
+            state = dict(saved)
+        if str(state["config_hash"]) != self.hash:
+            raise ValueError(f"{self.path} was saved by a run with other options or data")
+        return state
+
+    def due(self):
+        return time.monotonic() - self.last >= self.every
+
+    def save(self, **state):
+        if self.summary_path is not None:
+            state["summary_size"] = os.path.getsize(self.summary_path)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        # Written next to the old one and renamed, so a kill mid-write keeps the previous checkpoint
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            np.savez(f, config_hash=self.hash, **state)
+        os.replace(tmp, self.path)
+        self.last = time.monotonic()
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,70 @@
+from statistics import NormalDist
+
+import numpy as np
+
+
+# === Confidence intervals ===
+def z_score(confidence):
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+
+def wilson_intervals(counts, n, confidence=0.95):
+    z = z_score(confidence)
+    p = np.asarray(counts, dtype=float) / n
+    denom = 1 + z ** 2 / n
+    center = (p + z ** 2 / (2 * n)) / denom
+    half = z * np.sqrt(p * (1 - p) / n + z ** 2 / (4 * n ** 2)) / denom
+    return center - half, center + half
+
+
+def rank_order_separated(counts, n, confidence=0.95):
+    # Every neighbour pair in the ranking differs significantly (Bonferroni over all pairs)
+    p = np.sort(np.asarray(counts, dtype=float) / n)[::-1]
+    z = z_score(1 - (1 - confidence) / max(len(p) - 1, 1))
+    diff = p[:-1] - p[1:]
+    se = np.sqrt((p[:-1] + p[1:] - diff ** 2) / n)
+    return bool(np.all(diff > z * se))
+
+
+# === Stopping rule ===
+class ConvergenceCheck:
+    def __init__(self, ci_width=None, rank_order=False, confidence=0.95, min_simulations=10000):
+        self.ci_width = ci_width  # target full CI width in percentage points
+        self.rank_order = rank_order
+        self.confidence = confidence
+        self.min_simulations = min_simulations
+
+    def done(self, counts, n):
+        if n < self.min_simulations:
+            return False
+        if self.ci_width is not None:
+            low, high = wilson_intervals(counts, n, self.confidence)
+            if (high - low).max() * 100 <= self.ci_width:
+                return True
+        return self.rank_order and rank_order_separated(counts, n, self.confidence)
+
+
+# === Credible intervals (Bayesian matchups) ===
+# Each sampled win matrix plays draw_size tournaments; the spread of the win rates over the
+# draws is the uncertainty that comes from the matchup data, plus the Monte Carlo noise of
+# draw_size tournaments, so larger draws give sharper intervals.
+class PosteriorDraws:
+    def __init__(self, num_players, draw_size):
+        self.num_players = num_players
+        self.draw_size = draw_size
+        self.counts = []
+
+    def add(self, champions):
+        # champions of one batch: consecutive groups of draw_size share a matrix, the batch holds whole groups
+        if len(champions) % self.draw_size:
+            raise ValueError(f"{len(champions)} tournaments do not split into draws of {self.draw_size}")
+        for start in range(0, len(champions), self.draw_size):
+            self.counts.append(np.bincount(champions[start:start + self.draw_size], minlength=self.num_players))
+
+    def rates(self):
+        counts = np.array(self.counts)
+        return counts / counts.sum(axis=1, keepdims=True)
+
+    def intervals(self, confidence=0.95):
+        tail = (1 - confidence) / 2
+        return tuple(np.quantile(self.rates(), [tail, 1 - tail], axis=0))
@@ -0,0 +1,49 @@
+import numpy as np
+
+
+# === Exact single elimination ===
+def _play(W, slot1, slot2):
+    # Each slot is (player indices, probability that the player reaches it), batched over brackets
+    idx1, reach1 = slot1
+    idx2, reach2 = slot2
+    W_sub = W[idx1[:, :, np.newaxis], idx2[:, np.newaxis, :]]
+    win1 = reach1 * np.einsum("bij,bj->bi", W_sub, reach2)
+    win2 = reach2 * np.einsum("bij,bi->bj", 1 - W_sub, reach1)
+    return np.concatenate([idx1, idx2], axis=1), np.concatenate([win1, win2], axis=1)
+
+
+def bracket_win_probabilities(W, orders):
+    # orders[b] is the slot order of bracket b; result[b, i] - chance that player i wins bracket b
+    orders = np.atleast_2d(orders)
+    num_brackets, n = orders.shape
+    slots = [(orders[:, i:i + 1], np.ones((num_brackets, 1))) for i in range(n)]
+
+    while len(slots) > 1:
+        next_slots = [_play(W, slots[i], slots[i + 1]) for i in range(0, len(slots) - 1, 2)]
+        if len(slots) % 2:
+            # Same bye rule as generate_pairs: the odd slot goes last in the next round
+            next_slots.append(slots[-1])
+        slots = next_slots
+
+    idx, reach = slots[0]
+    result = np.zeros((num_brackets, W.shape[0]))
+    np.put_along_axis(result, idx, reach, axis=1)
+    return result
+
+
+# === Random seedings ===
+def sampled_seeding_win_probabilities(W, num_seedings, rng, batch_size=1000):
+    # Exact per bracket, averaged over randomly shuffled seedings; returns (mean, standard error)
+    n = W.shape[0]
+    total = np.zeros(n)
+    total_sq = np.zeros(n)
+    for start in range(0, num_seedings, batch_size):
+        size = min(batch_size, num_seedings - start)
+        orders = rng.permuted(np.tile(np.arange(n), (size, 1)), axis=1)
+        probs = bracket_win_probabilities(W, orders)
+        total += probs.sum(axis=0)
+        total_sq += (probs ** 2).sum(axis=0)
+
+    mean = total / num_seedings
+    variance = np.maximum(total_sq / num_seedings - mean ** 2, 0)
+    return mean, np.sqrt(variance / num_seedings)
@@ -0,0 +1,112 @@
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+from markov_chain import LOG_DIR as MARKOV_LOG_DIR, STATE_PATH, build_transition_matrix, format_rankings, \
+    load_markov_table, solve_power
+from matchup_table import ASSET_DIR, LOG_ROOT, changed_cells, load_matchup_table, load_snapshot, save_snapshot
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from tournament.batch import BATCH_SIZE, simulate_counts
+
+SIM_LOG_DIR = os.path.join(LOG_ROOT, "sim")
+PATHS_PATH = os.path.join(SIM_LOG_DIR, "paths.npz")
+
+
+# === Markov: warm start from the previous stationary distribution ===
+def update_markov(table, state_path=STATE_PATH, tol=1e-12):
+    P = build_transition_matrix(table.probs, table.counts)
+    state = load_snapshot(state_path)
+    cells = changed_cells(state, table)
+
+    if cells is None:
+        pi, iterations, residual = solve_power(P, tol=tol)
+    else:
+        pi, iterations, residual = solve_power(P, pi0=state["pi"], tol=tol)
+
+    save_snapshot(state_path, table, pi=pi)
+    return pi, iterations, residual, cells
+
+
+# === Monte Carlo: importance reweighting of stored tournament paths ===
+def path_weights(paths, W_new, chunk_size=100000):
+    W_old = paths["matrix"]
+    changed = W_new != W_old
+    log_win = np.zeros_like(W_new)
+    log_loss = np.zeros_like(W_new)
+    with np.errstate(divide="ignore"):
+        log_win[changed] = np.log(W_new[changed]) - np.log(W_old[changed])
+        log_loss[changed] = np.log1p(-W_new[changed]) - np.log1p(-W_old[changed])
+
+    # Outcomes that were impossible under the old table were never sampled, reweighting cannot recover them
+    if np.isposinf(log_win).any() or np.isposinf(log_loss).any():
+        return None
+
+    p1, p2, p1_won = paths["p1"], paths["p2"], paths["p1_won"]
+    log_weights = np.zeros(len(p1))
+    for start in range(0, len(p1), chunk_size):
+        rows = slice(start, start + chunk_size)
+        a, b = p1[rows].astype(np.int64), p2[rows].astype(np.int64)
+        log_weights[rows] = np.where(p1_won[rows], log_win[a, b], log_loss[a, b]).sum(axis=1)
+
+    if np.isneginf(log_weights).all():
+        return None
+    return np.exp(log_weights - log_weights.max())
+
+
+def update_simulation(table, paths_path=PATHS_PATH, min_ess=0.5, seed=None):
+    paths = load_snapshot(paths_path)
+    num_paths = len(paths["champions"]) if paths is not None else 0
+    cells = changed_cells(paths, table)
+    weights = path_weights(paths, table.matrix) if cells is not None else None
+
+    if weights is not None:
+        ess = weights.sum() ** 2 / (weights ** 2).sum()
+        if ess >= min_ess * num_paths:
+            probs = np.bincount(paths["champions"], weights=weights, minlength=len(table.names))
+            return probs / weights.sum(), cells, ess
+
+    # Not enough overlap with the stored paths: rerun the Monte Carlo from scratch
+    num_simulations = num_paths or 100000
+    counts = simulate_counts(table.matrix, num_simulations, BATCH_SIZE, seed)
+    return counts / num_simulations, cells, None
+
+
+def write_summary(log_dir, output):
+    os.makedirs(log_dir, exist_ok=True)
+    with open(os.path.join(log_dir, "summary.txt"), "w", encoding="utf-8") as f:
+        f.write(output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-rank fighters after a matchup data refresh")
+    parser.add_argument("--skip-markov", action="store_true")
+    parser.add_argument("--skip-sim", action="store_true")
+    parser.add_argument("--min-ess", type=float, default=0.5,
+                        help="minimum effective sample size (fraction of stored paths) to accept reweighting")
+    parser.add_argument("--seed", type=int, default=None, help="seed for a full rerun")
+    args = parser.parse_args()
+
+    if not args.skip_markov:
+        markov_table = load_markov_table()
+        pi, iterations, residual, cells = update_markov(markov_table)
+        changes = "full solve" if cells is None else f"{len(cells)} changed cells"
+        output = format_rankings(markov_table.names, pi)
+        print(output)
+        print(f"\nMarkov: {changes}, iterations: {iterations}, residual: {residual:.2e}\n")
+        write_summary(MARKOV_LOG_DIR, output)
+
+    if not args.skip_sim:
+        with open(os.path.join(ASSET_DIR, "players.json")) as f:
+            table = load_matchup_table(json.load(f), ASSET_DIR)
+        probs, cells, ess = update_simulation(table, min_ess=args.min_ess, seed=args.seed)
+        output = format_rankings(table.names, probs, title="simulation")
+        print(output)
+        if ess is None:
+            print("\nSimulation: full rerun")
+        else:
+            print(f"\nSimulation: {len(cells)} changed cells, reweighted, effective sample size {ess:.0f}")
+        write_summary(SIM_LOG_DIR, output)
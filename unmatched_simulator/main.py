@@ -1,30 +1,17 @@
-import pygame
-import pandas as pd
+import argparse
 import json
-import random
 import os
 import sys
+from functools import lru_cache
 
+from matchup_table import ASSET_DIR, LOG_ROOT, load_matchup_table
 
-# === Tee class for logging ===
-class Tee:
-    def __init__(self, *files):
-        self.files = files
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from tournament.bracket import generate_pairs
+from tournament.logs import LEVELS, open_log
+from tournament.rng import BIT_GENERATORS, DEFAULT_BIT_GENERATOR, RandomStream
 
-    def write(self, data):
-        for f in self.files:
-            f.write(data)
-            f.flush()
-
-    def flush(self):
-        for f in self.files:
-            f.flush()
-
-
-# === Logging setup ===
-os.makedirs("log/main", exist_ok=True)
-log_file = open("log/main/summary.txt", "w", encoding="utf-8")
-sys.stdout = Tee(sys.__stdout__, log_file)
+LOG_DIR = os.path.join(LOG_ROOT, "main")
 
 # === Pygame setup ===
 MATCH_WIDTH = 180
@@ -33,55 +20,33 @@ PADDING_Y = 20
 SCROLL_SPEED = 20
 FPS = 60
 
-pygame.init()
-screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-pygame.display.set_caption("Unmatched Tournament Simulator")
-font = pygame.font.SysFont("Arial", 16)
-clock = pygame.time.Clock()
 
 # === Load data ===
-with open("assets/players.json") as f:
-    players = json.load(f)
-
-matches_df = pd.read_csv("assets/matches_count.csv", index_col=0)
-probs_df = pd.read_csv("assets/probabilities.csv", index_col=0)
-id2name = {p['id']: p['name'] for p in players}
-
-
-# === Probability ===
-def get_match_probability(p1, p2):
-    name1 = id2name[p1]
-    name2 = id2name[p2]
-    count = matches_df.loc[name1, name2]
-    if count < 5:
-        return 50
-    prob = probs_df.loc[name1, name2]
-    return 50 if prob == -2 else 100 - prob
-
-
-# === Pairing ===
-def generate_pairs(player_list):
-    pairs, next_round = [], []
-    for i in range(0, len(player_list), 2):
-        if i + 1 < len(player_list):
-            pairs.append((player_list[i], player_list[i + 1]))
-        else:
-            next_round.append(player_list[i])
-    return pairs, next_round
+# Nothing is loaded and no window is opened on import; main() does that
+@lru_cache(maxsize=None)
+def load_data(asset_dir=ASSET_DIR):
+    with open(os.path.join(asset_dir, "players.json")) as f:
+        players = json.load(f)
+    table = load_matchup_table(players, asset_dir)
+    id2name = {p['id']: p['name'] for p in players}
+    return players, table, id2name
 
 
 # === Round simulation ===
-def simulate_round(current_players, round_num, start_match_id, logs):
-    pairs, next_round = generate_pairs(current_players)
+def simulate_round(current_players, round_num, start_match_id, log, rng):
+    _, table, id2name = load_data()
+    pairs, byes = generate_pairs(current_players)
+    next_round = []
     round_matches = []
     for p1, p2 in pairs:
-        prob = get_match_probability(p1, p2)
+        prob = table.win_probability(p1, p2)
         name1 = id2name[p1]
         name2 = id2name[p2]
-        winner = p1 if random.randint(1, 100) <= prob else p2
-        logs.append(
-            f"Round {round_num}: {name1} vs {name2}, Prob: {prob:.1f}%, Matches: {matches_df.loc[name1, name2]}, Winner: {id2name[winner]}"
-        )
+        winner = p1 if rng.random() * 100 < prob else p2
+        if log.matches:
+            log.match(
+                f"Round {round_num}: {name1} vs {name2}, Prob: {prob:.1f}%, Matches: {table.match_count(p1, p2)}, Winner: {id2name[winner]}"
+            )
         next_round.append(winner)
         round_matches.append({
             "id": start_match_id,
@@ -91,21 +56,25 @@ def simulate_round(current_players, round_num, start_match_id, logs):
             "winner": winner
         })
         start_match_id += 1
-    return round_matches, next_round, start_match_id
+    log.round(f"Round {round_num}: {len(pairs)} matches, {len(next_round) + len(byes)} players left")
+    # Byes go last, as in sim.py
+    return round_matches, next_round + byes, start_match_id
 
 
 # === Full tournament ===
-def run_tournament():
-    all_matches, rounds, logs = [], [], []
-    random.shuffle(players)
+def run_tournament(log, rng):
+    players, _, id2name = load_data()
+    all_matches, rounds = [], []
     current_players = [p['id'] for p in players]
+    rng.shuffle(current_players)
     round_num, match_id = 1, 1
 
     while len(current_players) > 1:
-        round_matches, current_players, match_id = simulate_round(current_players, round_num, match_id, logs)
+        round_matches, current_players, match_id = simulate_round(current_players, round_num, match_id, log, rng)
         rounds.append(round_matches)
         all_matches.extend(round_matches)
         round_num += 1
+    log.summary(f"Winner: {id2name[current_players[0]]}")
 
     match_coords = {}
     for r_idx, round_matches in enumerate(rounds):
@@ -116,17 +85,16 @@ def run_tournament():
                 50 + r_idx * (MATCH_WIDTH + 50),
                 offset_y + m_idx * spacing_y,
             )
-    return all_matches, match_coords, rounds, logs
+    return all_matches, match_coords, rounds
 
 
 # === Match drawing ===
-def draw_match(m, offset_x, offset_y):
-    x, y = match_coords[m['id']]
-    x += offset_x
-    y += offset_y
+def draw_card(surface, m, x, y, text):
+    import pygame
 
-    pygame.draw.rect(screen, (50, 50, 50), (x, y, MATCH_WIDTH, MATCH_HEIGHT), border_radius=6)
-    pygame.draw.rect(screen, (0, 255, 0), (x, y, MATCH_WIDTH, MATCH_HEIGHT), 2)
+    _, _, id2name = load_data()
+    pygame.draw.rect(surface, (50, 50, 50), (x, y, MATCH_WIDTH, MATCH_HEIGHT), border_radius=6)
+    pygame.draw.rect(surface, (0, 255, 0), (x, y, MATCH_WIDTH, MATCH_HEIGHT), 2)
 
     winner = m['winner']
     p1name = id2name.get(m['p1'], "???")
@@ -135,45 +103,67 @@ def draw_match(m, offset_x, offset_y):
     color_p1 = (0, 255, 0) if m['p1'] == winner else (255, 0, 0)
     color_p2 = (0, 255, 0) if m['p2'] == winner else (255, 0, 0)
 
-    screen.blit(font.render(p1name, True, color_p1), (x + 5, y + 5))
-    screen.blit(font.render(p2name, True, color_p2), (x + 5, y + 30))
+    surface.blit(text.render(p1name, color_p1), (x + 5, y + 5))
+    surface.blit(text.render(p2name, color_p2), (x + 5, y + 30))
+
+
+def card_key(m):
+    return m['p1'], m['p2'], m['winner']
 
 
 # === Main execution ===
-all_matches, match_coords, rounds, logs = run_tournament()
-for log in logs:
-    print(log)
-
-running = True
-scroll_x, scroll_y = 0, 0
-max_matches_in_round = max(len(r) for r in rounds)
-total_width = len(rounds) * (MATCH_WIDTH + 50) + 100
-total_height = (MATCH_HEIGHT + PADDING_Y) * (2 ** (len(rounds) - 1)) + 100
-
-while running:
-    screen.fill((20, 20, 20))
-    for m in all_matches:
-        draw_match(m, scroll_x, scroll_y)
-    pygame.display.flip()
-
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-        elif event.type == pygame.MOUSEWHEEL:
-            mods = pygame.key.get_mods()
-            if mods & pygame.KMOD_SHIFT:
-                scroll_x += event.y * SCROLL_SPEED
-                scroll_x = min(0, max(scroll_x, screen.get_width() - total_width))
-            else:
-                scroll_y += event.y * SCROLL_SPEED
-                scroll_y = min(0, max(scroll_y, screen.get_height() - total_height))
-        elif event.type == pygame.VIDEORESIZE:
-            screen = pygame.display.set_mode(event.size, pygame.RESIZABLE)
-        elif event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_r:
-                all_matches, match_coords, rounds, logs = run_tournament()
-                for log in logs:
-                    print(log)
-    clock.tick(FPS)
-
-pygame.quit()
+def main():
+    parser = argparse.ArgumentParser(description="Unmatched tournament bracket viewer (R draws a new tournament)")
+    parser.add_argument("--verbosity", choices=LEVELS, default="match",
+                        help="summary: the winner only; round: adds a line per round; match: adds every match")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="master seed: the same sequence of tournaments on every run (R included)")
+    parser.add_argument("--rng", choices=BIT_GENERATORS, default=DEFAULT_BIT_GENERATOR,
+                        help="bit generator behind the seed")
+    args = parser.parse_args()
+    rng = RandomStream(args.seed, args.rng)
+
+    import pygame
+    from tournament.render import BracketView
+
+    log = open_log(LOG_DIR, args.verbosity)
+    pygame.init()
+    screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+    pygame.display.set_caption("Unmatched Tournament Simulator")
+    font = pygame.font.SysFont("Arial", 16)
+    clock = pygame.time.Clock()
+    view = BracketView(screen, font, MATCH_WIDTH, MATCH_HEIGHT, draw_card, card_key, background=(20, 20, 20),
+                       margin=50)
+
+    def show_tournament():
+        all_matches, match_coords, rounds = run_tournament(log, rng)
+        log.flush()
+        view.reset(match_coords)
+        return {m['id']: m for m in all_matches}
+
+    by_id = show_tournament()
+    running = True
+
+    # Results are static: after the first frame only scrolling or a new tournament redraws
+    while running:
+        view.draw(by_id)
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.MOUSEWHEEL:
+                view.wheel(event, SCROLL_SPEED)
+            elif event.type == pygame.VIDEORESIZE:
+                view.screen = pygame.display.set_mode(event.size, pygame.RESIZABLE)
+                view.full_redraw = True
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_r:
+                    by_id = show_tournament()
+        clock.tick(FPS)
+
+    log.close()
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
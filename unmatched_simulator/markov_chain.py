@@ -1,53 +1,135 @@
-import numpy as np
-import pandas as pd
+import argparse
 import os
+import sys
+
+import numpy as np
+
+from matchup_table import ASSET_DIR, CACHE_DIR, LOG_ROOT, load_matchup_table, read_csv_names, save_snapshot
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from tournament.instrument import Instrument, profile
+
+LOG_DIR = os.path.join(LOG_ROOT, "markov_chain")
+STATE_PATH = os.path.join(CACHE_DIR, "markov_state.npz")
+
 
 # === 1. Завантаження таблиць ===
-probs_df = pd.read_csv("assets/probabilities.csv", index_col=0)
-matches_df = pd.read_csv("assets/matches_count.csv", index_col=0)
+def load_markov_table(asset_dir=ASSET_DIR):
+    # Фільтрація персонажів: без альтернативних версій і Yennefer
+    names = [name for name in read_csv_names(asset_dir)
+             if " alt " not in name.lower() and "yennefer" not in name.lower()]
+    players = [{"id": i, "name": name} for i, name in enumerate(names, start=1)]
+    return load_matchup_table(players, asset_dir)
 
-# === 1.1. Фільтрація персонажів
-filtered_names = [name for name in probs_df.index if " alt " not in name.lower() and "yennefer" not in name.lower()]
-probs_df = probs_df.loc[filtered_names, filtered_names]
-matches_df = matches_df.loc[filtered_names, filtered_names]
 
 # === 2. Побудова матриці ймовірностей з урахуванням матчів
-M = np.zeros_like(probs_df.values, dtype=float)
-for i, name1 in enumerate(probs_df.index):
-    for j, name2 in enumerate(probs_df.columns):
-        count = matches_df.iloc[i, j]
-        prob = probs_df.iloc[i, j]
-        if count < 5 or prob == -2:
-            M[i, j] = 50
-        else:
-            M[i, j] = prob
-
-# === 3. Стохастична матриця
-row_sums = M.sum(axis=1)
-P = M / row_sums[:, np.newaxis]
+def build_transition_matrix(probs, counts, min_matches=5):
+    M = np.where((counts < min_matches) | (probs == -2), 50.0, probs)
+    # === 3. Стохастична матриця
+    return M / M.sum(axis=1)[:, np.newaxis]
+
 
 # === 4. Стаціонарний розподіл (Марков)
-pi = np.ones(M.shape[0]) / M.shape[0]
-for _ in range(1000):
-    pi_next = pi @ P
-    if np.allclose(pi, pi_next, atol=1e-10):
-        break
-    pi = pi_next
+def _residual(pi, P):
+    return np.abs(pi @ P - pi).sum()
+
+
+def _aitken(x0, x1, x2):
+    # Componentwise Aitken delta-squared extrapolation, falling back to x2 where it is unstable
+    denom = x2 - 2 * x1 + x0
+    safe = np.abs(denom) > 1e-15
+    x = np.where(safe, x0 - (x1 - x0) ** 2 / np.where(safe, denom, 1), x2)
+    if np.any(x < 0):
+        return x2
+    return x / x.sum()
+
+
+def solve_power(P, pi0=None, tol=1e-12, max_iter=10000, aitken=False):
+    P_T = P.T
+    pi = np.ones(P.shape[0]) / P.shape[0] if pi0 is None else pi0 / pi0.sum()
+    history = []
+    residual = np.inf
+    for iteration in range(1, max_iter + 1):
+        pi_next = P_T @ pi
+        residual = np.abs(pi_next - pi).sum()
+        pi = pi_next / pi_next.sum()
+        if residual < tol:
+            return pi, iteration, residual
+        if aitken:
+            history.append(pi)
+            if len(history) == 3:
+                pi = _aitken(*history)
+                history = []
+    return pi, max_iter, residual
+
+
+def solve_direct(P):
+    # pi (P - I) = 0 with sum(pi) = 1: replace one balance equation by the normalisation
+    n = P.shape[0]
+    A = P.T - np.eye(n)
+    A[-1, :] = 1
+    b = np.zeros(n)
+    b[-1] = 1
+    pi = np.linalg.solve(A, b)
+    return pi, 1, _residual(pi, P)
+
+
+def solve_eigen(P):
+    values, vectors = np.linalg.eig(P.T)
+    pi = np.real(vectors[:, np.argmin(np.abs(values - 1))])
+    pi = pi / pi.sum()
+    return pi, 1, _residual(pi, P)
+
+
+SOLVERS = {"power": solve_power, "direct": solve_direct, "eigen": solve_eigen}
+
+
+def stationary_distribution(P, method="power", **options):
+    return SOLVERS[method](P, **options)
+
 
 # === 5. Формування результатів
-ranking = pd.Series(pi, index=probs_df.index).sort_values(ascending=False)
-ranking = (ranking / ranking.sum()) * 100  # нормалізація до 100%
-
-# === 6. Формування тексту
-lines = ["Tournament Winner Rankings (markov):"]
-for i, (name, percent) in enumerate(ranking.items(), start=1):
-    lines.append(f"{i}. {name} - {percent:.2f}% wins")
-output = "\n".join(lines)
-
-# === 7. Вивід у консоль
-print(output)
-
-# === 8. Запис у файл
-os.makedirs("log/markov_chain", exist_ok=True)
-with open("log/markov_chain/summary.txt", "w", encoding="utf-8") as f:
-    f.write(output)
+def format_rankings(names, pi, title="markov"):
+    ranking = sorted(zip(names, pi / pi.sum() * 100), key=lambda x: x[1], reverse=True)  # нормалізація до 100%
+    lines = [f"Tournament Winner Rankings ({title}):"]
+    for i, (name, percent) in enumerate(ranking, start=1):
+        lines.append(f"{i}. {name} - {percent:.2f}% wins")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Markov chain rankings of Unmatched fighters")
+    parser.add_argument("--solver", choices=sorted(SOLVERS), default="power")
+    parser.add_argument("--tol", type=float, default=1e-12, help="residual tolerance of the power iteration")
+    parser.add_argument("--aitken", action="store_true", help="Aitken extrapolation of the power iteration")
+    parser.add_argument("--instrument", action="store_true",
+                        help="time every phase and record peak RSS (instrumentation.json next to summary.txt)")
+    parser.add_argument("--profile", action="store_true", help="cProfile the run into profile.prof / profile.txt")
+    args = parser.parse_args()
+
+    instrument = Instrument(enabled=args.instrument)
+    with profile(LOG_DIR, args.profile):
+        with instrument.phase("load"):
+            table = load_markov_table()
+        with instrument.phase("build"):
+            P = build_transition_matrix(table.probs, table.counts)
+        options = {"tol": args.tol, "aitken": args.aitken} if args.solver == "power" else {}
+        with instrument.phase("solve"):
+            pi, iterations, residual = stationary_distribution(P, args.solver, **options)
+        # Keep pi with the table it was solved for, incremental.py warm-starts from it
+        with instrument.phase("snapshot"):
+            save_snapshot(STATE_PATH, table, pi=pi)
+
+    # === 6. Формування тексту
+    output = format_rankings(table.names, pi)
+
+    # === 7. Вивід у консоль
+    print(output)
+    print(f"\nSolver: {args.solver}, iterations: {iterations}, residual: {residual:.2e}")
+    if args.instrument:
+        print("\n".join(instrument.lines(instrument.write(LOG_DIR))))
+
+    # === 8. Запис у файл
+    os.makedirs(LOG_DIR, exist_ok=True)
+    with open(os.path.join(LOG_DIR, "summary.txt"), "w", encoding="utf-8") as f:
+        f.write(output)
@@ -0,0 +1,123 @@
+import csv
+import hashlib
+import os
+
+import numpy as np
+
+# Paths are relative to this folder, so the scripts work from any working directory
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ASSET_DIR = os.path.join(BASE_DIR, "assets")
+CACHE_DIR = os.path.join(BASE_DIR, "cache")
+LOG_ROOT = os.path.join(BASE_DIR, "log")
+MIN_MATCHES = 5
+# Beta(1, 1) prior: a matchup without games is equally likely to be anything from 0 to 100%
+PRIOR = (1.0, 1.0)
+
+
+# === Compiled matchup table ===
+class MatchupTable:
+    def __init__(self, players, probs, counts, min_matches=MIN_MATCHES):
+        self.names = [p['name'] for p in players]
+        self.ids = [p['id'] for p in players]
+        self.probs = probs
+        self.counts = counts
+
+        # player id -> row/column in the matrices
+        self._index = {pid: i for i, pid in enumerate(self.ids)}
+
+        self.set_min_matches(min_matches)
+
+    def set_min_matches(self, min_matches):
+        self.min_matches = min_matches
+        fallback = (self.counts < min_matches) | (self.probs == -2)
+        # Percent chance that the row player (first in the pair) beats the column player
+        self.percent = np.where(fallback, 50.0, 100.0 - self.probs)
+        self.matrix = self.percent / 100
+        self._percent_rows = self.percent.tolist()
+        self._count_rows = self.counts.astype(np.int64).tolist()
+
+    def beta_posterior(self, prior=PRIOR):
+        # (alpha, beta) for the chance that the row player wins: the prior plus games won and lost.
+        # No MIN_MATCHES fallback, a thin record just gives a wide posterior. Both cells of a pair
+        # are averaged (the export's counts can differ by a game), so alpha.T == beta.
+        known = self.probs != -2
+        games = np.where(known, self.counts, 0.0)
+        wins = np.where(known, (100 - self.probs) / 100 * self.counts, 0.0)
+        wins = (wins + games.T - wins.T) / 2
+        games = (games + games.T) / 2
+        return prior[0] + wins, prior[1] + games - wins
+
+    def win_probability(self, p1, p2):
+        return self._percent_rows[self._index[p1]][self._index[p2]]
+
+    def match_count(self, p1, p2):
+        return self._count_rows[self._index[p1]][self._index[p2]]
+
+
+# === Loading and caching ===
+def read_csv_names(asset_dir=ASSET_DIR):
+    # Fighter names from the probabilities.csv header, without parsing the whole table
+    with open(os.path.join(asset_dir, "probabilities.csv"), encoding="utf-8-sig", newline='') as f:
+        return next(csv.reader(f))[1:]
+
+
+def _cache_key(names, paths):
+    h = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            h.update(f.read())
+    h.update("\n".join(names).encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+def _parse_csv_tables(names, probs_path, counts_path):
+    import pandas as pd
+
+    probs_df = pd.read_csv(probs_path, index_col=0)
+    matches_df = pd.read_csv(counts_path, index_col=0)
+    probs = probs_df.loc[names, names].to_numpy(dtype=float)
+    counts = matches_df.loc[names, names].to_numpy(dtype=float)
+    return np.stack([probs, counts])
+
+
+def load_matchup_table(players, asset_dir=ASSET_DIR, min_matches=MIN_MATCHES, cache_dir=CACHE_DIR):
+    names = [p['name'] for p in players]
+    probs_path = os.path.join(asset_dir, "probabilities.csv")
+    counts_path = os.path.join(asset_dir, "matches_count.csv")
+
+    cache_path = None
+    if cache_dir:
+        key = _cache_key(names, [probs_path, counts_path])
+        cache_path = os.path.join(cache_dir, f"matchup_{key}.npy")
+
+    if cache_path and os.path.exists(cache_path):
+        tables = np.load(cache_path)
+    else:
+        tables = _parse_csv_tables(names, probs_path, counts_path)
+        if cache_path:
+            os.makedirs(cache_dir, exist_ok=True)
+            np.save(cache_path, tables)
+
+    return MatchupTable(players, tables[0], tables[1], min_matches)
+
+
+# === Snapshots for incremental updates ===
+def save_snapshot(path, table, **arrays):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    np.savez(path, names=np.array(table.names), probs=table.probs, counts=table.counts,
+             matrix=table.matrix, **arrays)
+
+
+def load_snapshot(path):
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as snapshot:
+        return dict(snapshot)
+
+
+def changed_cells(snapshot, table):
+    # (row, column) pairs whose data changed since the snapshot, None if the roster itself changed
+    if snapshot is None or list(snapshot["names"]) != table.names:
+        return None
+    changed = (snapshot["probs"] != table.probs) | (snapshot["counts"] != table.counts)
+    return np.argwhere(changed)
@@ -0,0 +1,140 @@
+import csv
+import os
+import struct
+
+import numpy as np
+
+# === Binary results format ===
+# 32-byte header followed by one fixed-width int16 record per tournament:
+# [winner_id, opponent_id_round_1, ..., opponent_id_round_R], -1 marks a bye.
+MAGIC = b"UMTRES01"
+HEADER = struct.Struct("<8sIQ12x")
+RECORD_DTYPE = np.int16
+
+
+# resume: (records, bytes) from position() at a checkpoint; the file is cut back to
+# that point and appended to, so a resumed run writes the same file as an uninterrupted one
+class BinaryLogWriter:
+    def __init__(self, path, ids, num_rounds, resume=None):
+        self.ids = np.asarray(ids, dtype=RECORD_DTYPE)
+        self.num_rounds = num_rounds
+        if resume:
+            self.count, size = resume
+            self.f = open(path, "r+b")
+            self.f.truncate(size)
+            self.f.seek(size)
+        else:
+            self.count = 0
+            self.f = open(path, "wb")
+            self._write_header()
+
+    def _write_header(self):
+        self.f.seek(0)
+        self.f.write(HEADER.pack(MAGIC, self.num_rounds, self.count))
+
+    def write(self, champions, defeated):
+        records = np.empty((len(champions), 1 + self.num_rounds), dtype=RECORD_DTYPE)
+        records[:, 0] = self.ids[champions]
+        if self.num_rounds:
+            records[:, 1:] = np.where(defeated >= 0, self.ids[defeated], -1)
+        self.f.write(records.tobytes())
+        self.count += len(champions)
+
+    def position(self):
+        self.f.flush()
+        return self.count, self.f.tell()
+
+    def close(self):
+        # The tournament count is only known at the end, patch it into the header
+        self._write_header()
+        self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CsvLogWriter:
+    def __init__(self, path, names, num_rounds, resume=None):
+        self.names = names
+        self.num_rounds = num_rounds
+        if resume:
+            self.count, size = resume
+            os.truncate(path, size)
+            self.f = open(path, "a", encoding="utf-8", newline='')
+        else:
+            self.count = 0
+            self.f = open(path, "w", encoding="utf-8", newline='')
+        self.writer = csv.writer(self.f, quoting=csv.QUOTE_MINIMAL, quotechar='"')
+        if not resume:
+            self.writer.writerow(["tournament", "winner"] + [f"round_{i}" for i in range(1, num_rounds + 1)])
+
+    def write(self, champions, defeated):
+        names = self.names
+        rows = []
+        for champion, opponents in zip(champions.tolist(), defeated[:, :self.num_rounds].tolist()):
+            self.count += 1
+            rows.append([self.count, names[champion]] + [names[o] if o >= 0 else "" for o in opponents])
+        self.writer.writerows(rows)
+
+    def position(self):
+        self.f.flush()
+        return self.count, os.fstat(self.f.fileno()).st_size
+
+    def close(self):
+        self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# === Reading ===
+class TournamentResults:
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            magic, self.num_rounds, self.count = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a tournament results file")
+        shape = (self.count, 1 + self.num_rounds)
+        if self.count:
+            self.records = np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER.size, shape=shape)
+        else:
+            self.records = np.empty(shape, dtype=RECORD_DTYPE)
+
+    @property
+    def winners(self):
+        return self.records[:, 0]
+
+    @property
+    def opponents(self):
+        return self.records[:, 1:]
+
+    def chunks(self, chunk_size=1_000_000):
+        for start in range(0, self.count, chunk_size):
+            yield self.records[start:start + chunk_size]
+
+    def win_counts(self, chunk_size=1_000_000):
+        counts = np.zeros(0, dtype=np.int64)
+        for chunk in self.chunks(chunk_size):
+            chunk_counts = np.bincount(chunk[:, 0])
+            if len(chunk_counts) > len(counts):
+                counts = np.pad(counts, (0, len(chunk_counts) - len(counts)))
+            counts[:len(chunk_counts)] += chunk_counts
+        return {pid: int(c) for pid, c in enumerate(counts) if c}
+
+    def paths(self, winner_id, chunk_size=1_000_000):
+        # Opponents beaten round by round in every tournament won by winner_id
+        for chunk in self.chunks(chunk_size):
+            yield np.asarray(chunk[chunk[:, 0] == winner_id, 1:])
+
+    def head_to_head(self, winner_id, opponent_id, chunk_size=1_000_000):
+        # How often winner_id beat opponent_id on the way to the title, per round
+        per_round = np.zeros(self.num_rounds, dtype=np.int64)
+        for path in self.paths(winner_id, chunk_size):
+            per_round += (path == opponent_id).sum(axis=0)
+        return per_round
@@ -1,85 +1,76 @@
 import json
-import pandas as pd
-import random
-import csv
+import numpy as np
+import argparse
 import os
 import sys
-from collections import Counter
+from functools import lru_cache
 
+from checkpoint import CHECKPOINT_EVERY, Checkpoint, config_hash
+from convergence import ConvergenceCheck, PosteriorDraws, wilson_intervals
+from exact import sampled_seeding_win_probabilities
+from matchup_table import ASSET_DIR, CACHE_DIR, LOG_ROOT, load_matchup_table, save_snapshot
+from results_io import BinaryLogWriter, CsvLogWriter
 
-# === Tee for stdout and log ===
-class Tee:
-    def __init__(self, *files):
-        self.files = files
-
-    def write(self, obj):
-        for f in self.files:
-            f.write(obj)
-            f.flush()
-
-    def flush(self):
-        for f in self.files:
-            f.flush()
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from tournament.batch import BATCH_SIZE, FORMATS, batch_counts, batch_plan, champion_matches, matches_per_tournament, \
+    posterior_batch_size, simulate_counts, simulate_format_batch, simulate_posterior_batch
+from tournament.instrument import Instrument, profile
+from tournament.bracket import generate_pairs
+from tournament.logs import LEVELS, Log, open_log
+from tournament.rng import BIT_GENERATORS, DEFAULT_BIT_GENERATOR, RandomStream, fresh_seed, generator
 
 
 # === Paths ===
-ASSET_DIR = "assets"
-LOG_DIR = "log/sim"
-os.makedirs(LOG_DIR, exist_ok=True)
-sys.stdout = Tee(sys.__stdout__, open(os.path.join(LOG_DIR, "summary.txt"), "w", encoding="utf-8"))
+LOG_DIR = os.path.join(LOG_ROOT, "sim")
+PATHS_PATH = os.path.join(LOG_DIR, "paths.npz")
+CHECKPOINT_NAME = "checkpoint.npz"
+
 
 # === Load data ===
-with open(os.path.join(ASSET_DIR, "players.json")) as f:
-    players = json.load(f)
+# Folder with players.json and the matchup CSVs (--assets)
+asset_dir = ASSET_DIR
 
-matches_df = pd.read_csv(os.path.join(ASSET_DIR, "matches_count.csv"), index_col=0)
-probs_df = pd.read_csv(os.path.join(ASSET_DIR, "probabilities.csv"), index_col=0)
-id2name = {p['id']: p['name'] for p in players}
 
+# Read on first use, so importing sim (e.g. from a worker process or a benchmark) costs nothing
+@lru_cache(maxsize=None)
+def read_data(path):
+    with open(os.path.join(path, "players.json")) as f:
+        players = json.load(f)
+    # Other asset folders (e.g. synthetic benchmark tables) keep their parsed cache next to them
+    cache_dir = CACHE_DIR if path == ASSET_DIR else os.path.join(path, "cache")
+    table = load_matchup_table(players, path, cache_dir=cache_dir)
+    id2name = {p['id']: p['name'] for p in players}
+    return players, table, id2name
 
-# === Helper functions ===
-def get_match_probability(p1, p2):
-    name1 = id2name[p1]
-    name2 = id2name[p2]
-    count = matches_df.loc[name1, name2]
-    if count < 5:
-        return 50
-    prob = probs_df.loc[name1, name2]
-    return 50 if prob == -2 else 100 - prob
-
-
-def generate_pairs(player_list):
-    pairs = []
-    next_round = []
-    for i in range(0, len(player_list), 2):
-        if i + 1 < len(player_list):
-            pairs.append((player_list[i], player_list[i + 1]))
-        else:
-            next_round.append(player_list[i])
-    return pairs, next_round
+
+def load_data():
+    return read_data(asset_dir)
 
 
-def run_tournament_with_rounds():
+# === Helper functions ===
+def run_tournament_with_rounds(rng, output=None, number=0):
+    # rng: RandomStream (or anything with shuffle() and random())
+    players, table, id2name = load_data()
+    log_matches = output is not None and output.matches
     current_players = [p['id'] for p in players]
-    random.shuffle(current_players)
+    rng.shuffle(current_players)
     all_rounds = []
     all_matches = []
 
     while len(current_players) > 1:
-        next_players = []
+        pairs, byes = generate_pairs(current_players)
         this_round = []
-        for i in range(0, len(current_players), 2):
-            if i + 1 < len(current_players):
-                p1, p2 = current_players[i], current_players[i + 1]
-                prob = get_match_probability(p1, p2)
-                winner = p1 if random.randint(1, 100) <= prob else p2
-                loser = p2 if winner == p1 else p1
-                next_players.append(winner)
-                this_round.append((winner, loser))
-            else:
-                next_players.append(current_players[i])
+        for p1, p2 in pairs:
+            prob = table.win_probability(p1, p2)
+            # prob is in percent; a full-resolution uniform instead of randint(1, 100)
+            winner = p1 if rng.random() * 100 < prob else p2
+            loser = p2 if winner == p1 else p1
+            this_round.append((winner, loser))
+            if log_matches:
+                output.match(f"T{number} R{len(all_rounds) + 1}: {id2name[p1]} vs {id2name[p2]}, "
+                             f"Prob: {prob:.1f}%, Winner: {id2name[winner]}")
         all_rounds.append(this_round)
-        current_players = next_players
+        current_players = [winner for winner, _ in this_round] + byes
 
     winner_id = current_players[0]
     winner_name = id2name[winner_id]
@@ -93,45 +84,350 @@ def run_tournament_with_rounds():
     return winner_name, defeated_per_round
 
 
-def run_simulations(num_simulations=10000):
-    winners = []
-    rows = []
-    max_rounds = 0
-
-    for i in range(1, num_simulations + 1):
-        winner, rounds = run_tournament_with_rounds()
-        winners.append(winner)
-        row = {"tournament": i, "winner": winner}
-        for r, defeated_list in enumerate(rounds, start=1):
-            row[f"round_{r}"] = ", ".join(defeated_list)
-        max_rounds = max(max_rounds, len(rounds))
-        rows.append(row)
-
-    # Write CSV
-    fieldnames = ["tournament", "winner"] + [f"round_{i}" for i in range(1, max_rounds + 1)]
-    with open(LOG_DIR + "/tournament_log.csv", "w", encoding="utf-8", newline='') as f:
-        writer = csv.DictWriter(
-            f,
-            fieldnames=fieldnames,
-            quoting=csv.QUOTE_MINIMAL,
-            quotechar='"'
-        )
-        writer.writeheader()
-        writer.writerows(rows)
+def log_batch_matches(output, first, p1, p2, p1_won):
+    # Every match of a batch from the batch engine, numbered like the tournament log
+    names = load_data()[1].names
+    for number, row in enumerate(zip(p1.tolist(), p2.tolist(), p1_won.tolist()), start=first):
+        for a, b, won in zip(*row):
+            output.match(f"T{number}: {names[a]} vs {names[b]}, Winner: {names[a] if won else names[b]}")
+
+
+def format_log_dir(fmt):
+    # Single elimination keeps the original location; the other formats get a subfolder each
+    return LOG_DIR if fmt == "single" else os.path.join(LOG_DIR, fmt)
+
+
+def run_tournaments_python(num_simulations, batch_size=BATCH_SIZE, output=None, seed=None,
+                           bit_generator=DEFAULT_BIT_GENERATOR, skip=0):
+    # Same batches and substreams as the batch engine, one buffered stream per batch;
+    # skip: batches already done (resumed run)
+    players, table, _ = load_data()
+    index = {name: i for i, name in enumerate(table.names)}
+    num_rounds = champion_matches("single", len(players))
+    plan = batch_plan(num_simulations, batch_size, seed)
+    start = sum(size for size, _ in plan[:skip])
+    for size, seed_seq in plan[skip:]:
+        rng = RandomStream(seed_seq, bit_generator)
+        champions = np.empty(size, dtype=np.int64)
+        defeated = np.full((size, num_rounds), -1, dtype=np.int64)
+        for t in range(size):
+            winner, rounds = run_tournament_with_rounds(rng, output, start + t + 1)
+            champions[t] = index[winner]
+            for r, defeated_list in enumerate(rounds):
+                if defeated_list:
+                    defeated[t, r] = index[defeated_list[0]]
+        start += size
+        yield champions, defeated
+
+
+def run_tournaments_batch(num_simulations, batch_size=BATCH_SIZE, seed=None, record_matches=False, fmt="single",
+                          bit_generator=DEFAULT_BIT_GENERATOR, skip=0, draw_size=None):
+    # draw_size: Bayesian mode, every draw_size tournaments play on a win matrix sampled from the data
+    _, table, _ = load_data()
+    alpha, beta = table.beta_posterior() if draw_size else (None, None)
+    for size, seed_seq in batch_plan(num_simulations, batch_size, seed)[skip:]:
+        rng = generator(seed_seq, bit_generator)
+        if draw_size:
+            yield simulate_posterior_batch(fmt, alpha, beta, size, rng, draw_size, record_matches)
+        else:
+            yield simulate_format_batch(fmt, table.matrix, size, rng, record_matches)
+
+
+def rank_counts(counts):
+    players, _, _ = load_data()
+    rankings = [(p['name'], counts[p['name']]) for p in players]
+    return sorted(rankings, key=lambda x: x[1], reverse=True)
+
+
+def resume_point(resume, num_players):
+    # (batches done, tournaments done, winner counts) of a checkpoint, or of a fresh start
+    if resume is None:
+        return 0, 0, np.zeros(num_players, dtype=np.int64)
+    return int(resume["batches"]), int(resume["completed"]), resume["winner_counts"].astype(np.int64)
+
+
+def run_simulations_parallel(num_simulations, seed=None, workers=2, fmt="single", instrument=None,
+                             bit_generator=DEFAULT_BIT_GENERATOR, checkpoint=None, resume=None):
+    instrument = instrument or Instrument(enabled=False)
+    with instrument.phase("load"):
+        _, table, _ = load_data()
+    if checkpoint is None and resume is None:
+        with instrument.phase("simulate"):
+            counts = simulate_counts(table.matrix, num_simulations, BATCH_SIZE, seed, workers, fmt, bit_generator)
+        done = 0
+    else:
+        # Batch results come back in plan order, so the counts can be checkpointed as they arrive
+        plan = batch_plan(num_simulations, BATCH_SIZE, seed)
+        skip, done, counts = resume_point(resume, len(table.names))
+        with instrument.phase("simulate"):
+            for batch, batch_winners in enumerate(batch_counts(table.matrix, plan[skip:], workers, fmt,
+                                                               bit_generator), start=skip + 1):
+                counts += batch_winners
+                if checkpoint is not None and checkpoint.due():
+                    with instrument.phase("checkpoint"):
+                        checkpoint.save(seed=str(seed), batches=batch, winner_counts=counts,
+                                        completed=sum(size for size, _ in plan[:batch]))
+        if checkpoint is not None:
+            checkpoint.remove()
+    instrument.count("tournaments", num_simulations - done)
+    instrument.count("matches", (num_simulations - done) * matches_per_tournament(fmt, len(table.names)))
+    return rank_counts(dict(zip(table.names, counts.tolist()))), num_simulations
+
+
+def run_exact(num_seedings=20000, seed=None, bit_generator=DEFAULT_BIT_GENERATOR):
+    # Exact win chances per bracket, averaged over sampled random seedings
+    _, table, _ = load_data()
+    probs, _ = sampled_seeding_win_probabilities(table.matrix, num_seedings, generator(seed, bit_generator))
+    return rank_counts(dict(zip(table.names, probs.tolist())))
+
+
+def open_tournament_log(log_format, log_rounds, fmt="single", log_dir=None, resume=None):
+    # One column per match the champion can win: bracket rounds, or Swiss rounds;
+    # resume: writer position saved in a checkpoint
+    players, table, _ = load_data()
+    num_rounds = champion_matches(fmt, len(players)) if log_rounds else 0
+    log_dir = log_dir or format_log_dir(fmt)
+    if log_format == "bin":
+        return BinaryLogWriter(os.path.join(log_dir, "tournament_log.bin"), table.ids, num_rounds, resume)
+    return CsvLogWriter(os.path.join(log_dir, "tournament_log.csv"), table.names, num_rounds, resume)
+
+
+def run_simulations(num_simulations=10000, engine="batch", seed=None, workers=1, log_rounds=True, log_format="csv",
+                    stop=None, store_paths=False, fmt="single", output=None, log_dir=None, instrument=None,
+                    bit_generator=DEFAULT_BIT_GENERATOR, checkpoint=None, resume=None, draws=None):
+    # output: Log for progress (round level, one line per batch) and every match (match level);
+    # instrument: per-phase times and counters (--instrument);
+    # seed + bit_generator: the same pair gives the same results, with any number of workers;
+    # checkpoint: Checkpoint saved every few seconds between batches (not with store_paths),
+    # resume: the state it loaded, to carry on where that run stopped;
+    # draws: PosteriorDraws for the Bayesian mode (batch engine, serial), collects the win rates per sampled matrix
+    output = output or Log()
+    instrument = instrument or Instrument(enabled=False)
+    if resume is not None:
+        seed = int(resume["seed"])
+    elif checkpoint is not None and seed is None:
+        # An unseeded run still needs its seed stored to be resumable
+        seed = fresh_seed()
+    if engine == "batch" and workers > 1:
+        # Workers return winner counts only, the per-tournament log is not written
+        return run_simulations_parallel(num_simulations, seed, workers, fmt, instrument, bit_generator,
+                                        checkpoint, resume)
+
+    with instrument.phase("load"):
+        players, table, _ = load_data()
+    matches_each = matches_per_tournament(fmt, len(players))
+    skip, completed, winner_counts = resume_point(resume, len(players))
+    if draws is not None and resume is not None:
+        draws.counts = list(resume["draw_counts"])
+    if engine == "python":
+        tournaments = run_tournaments_python(num_simulations, output=output, seed=seed, bit_generator=bit_generator,
+                                             skip=skip)
+    elif draws is not None:
+        # Batches of whole draws, so every sampled matrix plays exactly draw_size tournaments
+        tournaments = run_tournaments_batch(num_simulations, posterior_batch_size(draws.draw_size), seed,
+                                            output.matches, fmt, bit_generator, skip, draws.draw_size)
+    else:
+        tournaments = run_tournaments_batch(num_simulations, seed=seed, record_matches=store_paths or output.matches,
+                                            fmt=fmt, bit_generator=bit_generator, skip=skip)
+
+    # Log batch by batch, so memory does not grow with the number of tournaments
+    paths = []
+    log_position = tuple(resume["log_position"].tolist()) if resume is not None else None
+    with open_tournament_log(log_format, log_rounds, fmt, log_dir, log_position) as log:
+        for batch, (champions, defeated, *matches) in enumerate(instrument.iterate(tournaments, "simulate"),
+                                                                 start=skip + 1):
+            winner_counts += np.bincount(champions, minlength=len(players))
+            completed += len(champions)
+            if draws is not None:
+                draws.add(champions)
+            instrument.count("tournaments", len(champions))
+            instrument.count("matches", len(champions) * matches_each)
+            with instrument.phase("log"):
+                log.write(champions, defeated)
+                if matches and output.matches:
+                    log_batch_matches(output, completed - len(champions) + 1, *matches[0])
+            if matches and store_paths:
+                paths.append((champions, *matches[0]))
+            if output.rounds:
+                leader = winner_counts.argmax()
+                output.round(f"[BATCH] {completed} tournaments, leader {table.names[leader]} "
+                             f"{winner_counts[leader] / completed * 100:.2f}%")
+            # Adaptive mode: num_simulations is an upper bound, stop once the estimates have converged
+            if stop is not None and stop.done(winner_counts, completed):
+                break
+            if checkpoint is not None and checkpoint.due():
+                with instrument.phase("checkpoint"):
+                    # Logs first: the checkpoint points at what is already on disk
+                    output.flush()
+                    extra = {"draw_counts": np.array(draws.counts)} if draws is not None else {}
+                    checkpoint.save(seed=str(seed), batches=batch, completed=completed, winner_counts=winner_counts,
+                                    log_position=np.array(log.position()), **extra)
+    if checkpoint is not None:
+        checkpoint.remove()
+
+    if paths:
+        # Full match paths with the table they were sampled from, for reweighting in incremental.py
+        with instrument.phase("paths"):
+            champions, p1, p2, p1_won = (np.concatenate(column) for column in zip(*paths))
+            save_snapshot(PATHS_PATH, table, champions=champions.astype(np.int16), p1=p1.astype(np.int16),
+                          p2=p2.astype(np.int16), p1_won=p1_won)
 
     # Final stats
-    winner_counts = Counter(winners)
-    for p in players:
-        if p['name'] not in winner_counts:
-            winner_counts[p['name']] = 0
-    rankings = sorted(winner_counts.items(), key=lambda x: x[1], reverse=True)
-    return rankings, num_simulations
+    return rank_counts(dict(zip(table.names, winner_counts.tolist()))), completed
+
+
+# === Checkpoints ===
+# Options that do not change the results, so a run can be resumed with other values
+RUN_ONLY_OPTIONS = ("workers", "log_thread", "assets", "instrument", "profile", "checkpoint_every", "resume")
+
+
+def open_checkpoint(args, log_dir):
+    # (Checkpoint, saved state to resume from or None); raises ValueError for a checkpoint of another run
+    config = {key: value for key, value in vars(args).items() if key not in RUN_ONLY_OPTIONS}
+    # Worker processes skip the tournament log, so a parallel run only resumes as a parallel run
+    config["parallel"] = args.engine == "batch" and args.workers > 1
+    summary_path = os.path.join(log_dir, "summary.txt")
+    table = load_data()[1]
+    checkpoint = Checkpoint(os.path.join(log_dir, CHECKPOINT_NAME), config_hash(config, table.probs, table.counts),
+                            args.checkpoint_every, summary_path)
+    resume = checkpoint.load() if args.resume else None
+    if resume is not None:
+        # Cut the log back to the checkpoint, the resumed run appends the rest
+        os.truncate(summary_path, int(resume["summary_size"]))
+        print(f"Resuming from {checkpoint.path}: {int(resume['completed'])} of {args.simulations} tournaments done")
+    elif args.resume:
+        print(f"No checkpoint in {log_dir}, starting from the beginning")
+    return checkpoint, resume
 
 
 # === Run ===
-if __name__ == "__main__":
-    rankings, num_simulations = run_simulations(100000)
-    print("Tournament Winner Rankings (simulation):")
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Unmatched tournament Monte Carlo simulation")
+    parser.add_argument("-n", "--simulations", type=int, default=100000)
+    parser.add_argument("--engine", choices=["batch", "python", "exact"], default="batch")
+    parser.add_argument("--format", choices=FORMATS, default="single",
+                        help="tournament format (double and swiss need the batch engine)")
+    parser.add_argument("--seedings", type=int, default=20000, help="sampled seedings for the exact engine")
+    parser.add_argument("--workers", type=int, default=1, help="number of worker processes (batch engine)")
+    parser.add_argument("--seed", type=int, default=None, help="master seed for reproducible runs (any engine)")
+    parser.add_argument("--rng", choices=BIT_GENERATORS, default=DEFAULT_BIT_GENERATOR,
+                        help="bit generator behind the seed")
+    parser.add_argument("--no-rounds", action="store_true", help="log only the winner of each tournament")
+    parser.add_argument("--log-format", choices=["csv", "bin"], default="csv",
+                        help="tournament log as CSV or as compact binary records")
+    parser.add_argument("--ci-width", type=float, default=None,
+                        help="adaptive mode: stop once every win-rate CI is narrower than this (percentage points)")
+    parser.add_argument("--rank-order", action="store_true",
+                        help="adaptive mode: stop once the whole rank order is significant")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--store-paths", action="store_true",
+                        help="keep every match of every tournament for incremental re-ranking")
+    parser.add_argument("--verbosity", choices=LEVELS, default="summary",
+                        help="summary: rankings only; round: adds a progress line per batch; match: adds every match")
+    parser.add_argument("--log-thread", action="store_true", help="write the log file from a background thread")
+    parser.add_argument("--assets", default=ASSET_DIR, help="folder with players.json and the matchup CSVs")
+    parser.add_argument("--instrument", action="store_true",
+                        help="time every phase, count tournaments/matches per second and peak RSS "
+                             "(instrumentation.json next to summary.txt)")
+    parser.add_argument("--profile", action="store_true", help="cProfile the run into profile.prof / profile.txt")
+    parser.add_argument("--bayes", action="store_true",
+                        help="draw the matchup win rates from Beta posteriors of the wins and games played "
+                             "instead of taking them as exact; reports credible intervals")
+    parser.add_argument("--draw-size", type=int, default=BATCH_SIZE,
+                        help="tournaments played on each sampled win matrix (--bayes)")
+    parser.add_argument("--checkpoint-every", type=float, default=CHECKPOINT_EVERY,
+                        help="seconds between checkpoints (checkpoint.npz next to summary.txt), 0 turns them off")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue the interrupted run with the same options from its last checkpoint")
+    args = parser.parse_args(argv)
+    if args.format != "single" and (args.engine != "batch" or args.store_paths):
+        parser.error(f"--format {args.format} runs on the batch engine only, without --store-paths")
+    if args.bayes and (args.engine != "batch" or args.workers > 1 or args.store_paths):
+        parser.error("--bayes runs on the batch engine, serially and without --store-paths")
+    if args.bayes and (args.ci_width is not None or args.rank_order):
+        # The stopping rules only measure Monte Carlo error, they would stop after a few sampled matrices
+        parser.error("--bayes needs a fixed -n, drop --ci-width / --rank-order")
+    if args.workers > 1 and args.engine != "batch":
+        parser.error(f"--workers runs on the batch engine only, the {args.engine} engine is serial")
+    if args.draw_size < 1:
+        parser.error("--draw-size must be at least 1")
+    if args.bayes and args.simulations % args.draw_size:
+        # A last, smaller group would be a noisier sample in the credible intervals
+        parser.error(f"--bayes needs -n to be a multiple of --draw-size ({args.draw_size})")
+    global asset_dir
+    asset_dir = os.path.abspath(args.assets)
+
+    stop = None
+    if args.ci_width is not None or args.rank_order:
+        if args.workers > 1:
+            parser.error("adaptive stopping runs batches serially, drop --workers")
+        if args.engine == "exact":
+            parser.error("--ci-width / --rank-order stop a simulation, the exact engine has no sampling error")
+        stop = ConvergenceCheck(args.ci_width, args.rank_order, args.confidence, min_simulations=BATCH_SIZE)
+
+    log_dir = format_log_dir(args.format)
+    checkpoint = resume = None
+    if args.engine != "exact" and not args.store_paths and args.checkpoint_every > 0:
+        try:
+            checkpoint, resume = open_checkpoint(args, log_dir)
+        except ValueError as e:
+            parser.error(f"{e}, run without --resume to start over")
+    elif args.resume:
+        parser.error("--resume needs checkpoints: a simulation engine, without --store-paths or --checkpoint-every 0")
+
+    instrument = Instrument(enabled=args.instrument)
+    with open_log(log_dir, args.verbosity, background=args.log_thread, append=resume is not None) as output:
+        with profile(log_dir, args.profile):
+            report(args, stop, output, instrument, checkpoint, resume)
+        if args.instrument:
+            for line in instrument.lines(instrument.write(log_dir)):
+                output.summary(line)
+
+
+def report(args, stop, output, instrument, checkpoint=None, resume=None):
+    draws = PosteriorDraws(len(load_data()[0]), args.draw_size) if args.bayes else None
+    if args.engine == "exact":
+        with instrument.phase("exact"):
+            rankings, total = run_exact(args.seedings, args.seed, args.rng), 1
+        output.summary("Tournament Winner Rankings (exact):")
+    else:
+        rankings, total = run_simulations(
+            args.simulations, engine=args.engine, seed=args.seed, workers=args.workers,
+            log_rounds=not args.no_rounds, log_format=args.log_format, stop=stop,
+            store_paths=args.store_paths, fmt=args.format, output=output, instrument=instrument,
+            bit_generator=args.rng, checkpoint=checkpoint, resume=resume, draws=draws
+        )
+        output.summary("Tournament Winner Rankings (simulation):" if args.format == "single"
+                       else f"Tournament Winner Rankings (simulation, {args.format}):")
+    intervals = wilson_intervals([wins for _, wins in rankings], total, args.confidence) if stop else None
+    if draws is not None:
+        output.summary(f"Matchups sampled from their Beta posteriors: {len(draws.counts)} matrices, "
+                       f"{total // len(draws.counts)} tournaments each")
+        # Credible intervals in ranking order
+        position = {name: i for i, name in enumerate(load_data()[1].names)}
+        order = [position[name] for name, _ in rankings]
+        low, high = draws.intervals(args.confidence)
+        intervals = low[order], high[order]
     for rank, (name, wins) in enumerate(rankings, start=1):
-        percent = wins / num_simulations * 100
-        print(f"{rank}. {name} - {percent:.2f}% wins")
+        percent = wins / total * 100
+        if draws is not None:
+            low, high = intervals[0][rank - 1] * 100, intervals[1][rank - 1] * 100
+            output.summary(f"{rank}. {name} - {percent:.2f}% wins "
+                           f"({args.confidence:.0%} credible interval {low:.2f}-{high:.2f}%)")
+        elif intervals is not None:
+            low, high = intervals[0][rank - 1] * 100, intervals[1][rank - 1] * 100
+            output.summary(f"{rank}. {name} - {percent:.2f}% wins ({args.confidence:.0%} CI {low:.2f}-{high:.2f}%)")
+        else:
+            output.summary(f"{rank}. {name} - {percent:.2f}% wins")
+    if stop is not None:
+        # The same check the run stopped on; False means the -n cap ended it first
+        target = " or ".join(([f"every CI within {args.ci_width} points"] if args.ci_width is not None else [])
+                              + (["rank order significant"] if args.rank_order else []))
+        if stop.done([wins for _, wins in rankings], total):
+            output.summary(f"Stopped after {total} tournaments: target reached ({target})")
+        else:
+            output.summary(f"Warning: stopped at the -n cap of {total} tournaments before the target ({target})")
+
+
+if __name__ == "__main__":
+    main()
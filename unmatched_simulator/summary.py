@@ -1,24 +1,68 @@
+import argparse
+import json
+import os
+import re
+
 import pandas as pd
 
+from matchup_table import ASSET_DIR, LOG_ROOT
+from results_io import TournamentResults
+
+
+# Same order as tournament.batch.FORMATS
+SIM_FORMATS = ("single", "double", "swiss")
+SUMMARY_LINE = re.compile(r"^\d+\.\s+(.+) - ([\d.]+)% wins")
+
 
 def read_summary(path):
+    # Ranking lines may carry a trailing confidence interval, e.g. "(95% CI 4.60-4.86%)"
     data = {}
     with open(path, encoding="utf-8") as f:
         for line in f:
-            if " - " in line and "% wins" in line:
-                name = line.split(" - ")[0].split(". ", 1)[-1].strip()
-                percent = float(line.split(" - ")[1].replace("% wins", "").strip())
-                data[name] = percent
+            match = SUMMARY_LINE.match(line.strip())
+            if match:
+                data[match.group(1).strip()] = float(match.group(2))
     return data
 
 
+def read_results(path, players_path=os.path.join(ASSET_DIR, "players.json")):
+    with open(players_path) as f:
+        id2name = {p['id']: p['name'] for p in json.load(f)}
+    results = TournamentResults(path)
+    counts = results.win_counts()
+    return {name: counts.get(pid, 0) / results.count * 100 for pid, name in id2name.items()}
+
+
+def compare_formats(sim_dir=os.path.join(LOG_ROOT, "sim")):
+    # Win rates of every format that sim.py has a summary for, side by side
+    paths = {fmt: os.path.join(sim_dir, "summary.txt" if fmt == "single" else os.path.join(fmt, "summary.txt"))
+             for fmt in SIM_FORMATS}
+    df = pd.DataFrame({f"{fmt} (%)": pd.Series(read_summary(path)) for fmt, path in paths.items()
+                       if os.path.exists(path)})
+    df = df.sort_values(df.columns[0], ascending=False)
+    output_path = os.path.join(sim_dir, "format_comparison.csv")
+    df.to_csv(output_path, index_label="Character")
+    print(f"✅ CSV saved to: {output_path}")
+    print(df.head(10))
+
+
+parser = argparse.ArgumentParser(description="Compare Markov and simulation rankings")
+parser.add_argument("--sim-results", help="binary tournament log to read simulation win rates from")
+parser.add_argument("--formats", action="store_true",
+                    help="compare the simulated formats (sim.py --format) with each other instead")
+args = parser.parse_args()
+
+if args.formats:
+    compare_formats()
+    raise SystemExit
+
 # === Шляхи до файлів ===
-path_markov = "log/markov_chain/summary.txt"
-path_sim = "log/sim/summary.txt"
+path_markov = os.path.join(LOG_ROOT, "markov_chain", "summary.txt")
+path_sim = os.path.join(LOG_ROOT, "sim", "summary.txt")
 
 # === Зчитування даних ===
 markov = read_summary(path_markov)
-sim = read_summary(path_sim)
+sim = read_results(args.sim_results) if args.sim_results else read_summary(path_sim)
 
 # === Об'єднання у DataFrame ===
 all_names = sorted(set(markov) | set(sim))
@@ -32,7 +76,7 @@ df["Average Wins (%)"] = ((df["Simulation Wins (%)"] + df["Markov Wins (%)"]) /
 df = df.sort_values("Average Wins (%)", ascending=False)
 
 # === Збереження у CSV ===
-output_path = "log/markov_chain/markov_vs_simulation_comparison.csv"
+output_path = os.path.join(LOG_ROOT, "markov_chain", "markov_vs_simulation_comparison.csv")
 df.to_csv(output_path, index_label="Character")
 
 # === Виведення логів ===